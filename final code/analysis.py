@@ -1,17 +1,15 @@
 # analysis.py
 
-import pandas as pd
-from utils import categorize_app
-from constants import APP_CATEGORIES
+from constants import USAGE_PATTERN_THRESHOLDS, RECOMMENDATION_THRESHOLDS
+from enrich import as_enriched
 
-def analyze_usage_patterns(screen_time_data):
+def analyze_usage_patterns(screen_time_data, thresholds=USAGE_PATTERN_THRESHOLDS):
     """Analyze usage patterns with more sophisticated insights."""
-    usage_data = screen_time_data.copy()
-    usage_data['Category'] = usage_data['Application'].apply(categorize_app)
-    category_usage = usage_data.groupby('Category')['Time_Minutes'].sum()
+    usage = as_enriched(screen_time_data)
+    category_usage = usage.category_usage
     
     insights = []
-    total_time = usage_data['Time_Minutes'].sum()
+    total_time = usage.total_time
     
     if total_time > 0:
         # Calculate advanced metrics
@@ -21,31 +19,31 @@ def analyze_usage_patterns(screen_time_data):
         communication_ratio = category_usage.get('Communication', 0) / total_time
         
         # Generate dynamic insights based on usage patterns
-        if productivity_ratio < 0.3:
+        if productivity_ratio < thresholds['low_productivity']:
             insights.append({
                 'type': 'warning',
                 'message': "🎯 Low productivity detected. Consider using time-blocking techniques."
             })
-        elif productivity_ratio > 0.7:
+        elif productivity_ratio > thresholds['high_productivity']:
             insights.append({
                 'type': 'info',
                 'message': "⚡ High productivity! Remember to take breaks to avoid burnout."
             })
             
-        if entertainment_ratio > 0.4:
+        if entertainment_ratio > thresholds['entertainment']:
             insights.append({
                 'type': 'warning',
                 'message': "⚠️ High entertainment usage. Try setting specific leisure time windows."
             })
             
-        if communication_ratio > 0.3:
+        if communication_ratio > thresholds['communication']:
             insights.append({
                 'type': 'info',
                 'message': "💬 Consider batching communication tasks to reduce context switching."
             })
             
         # Time management insights
-        if total_time > 120:
+        if total_time > thresholds['long_day_minutes']:
             insights.append({
                 'type': 'health',
                 'message': "🧘 Practice the 20-20-20 rule: Every 20 minutes, look 20 feet away for 20 seconds."
@@ -53,35 +51,32 @@ def analyze_usage_patterns(screen_time_data):
     
     return insights, category_usage
 
-def generate_ai_recommendations(usage_data, total_time):
+def generate_ai_recommendations(usage_data, total_time, thresholds=RECOMMENDATION_THRESHOLDS):
     """Generate personalized AI recommendations based on usage patterns."""
     recommendations = []
     
-    # Add category column before grouping
-    usage_data_with_category = usage_data.copy()
-    usage_data_with_category['Category'] = usage_data_with_category['Application'].apply(categorize_app)
-    category_usage = usage_data_with_category.groupby('Category')['Time_Minutes'].sum()
+    category_usage = as_enriched(usage_data).category_usage
     
     # Work-life balance recommendations
     if 'Productivity' in category_usage:
         prod_time = category_usage['Productivity']
-        if prod_time > total_time * 0.7:
+        if prod_time > total_time * thresholds['high_productivity']:
             recommendations.append("🎯 Consider implementing regular break intervals using the Pomodoro Technique")
-        elif prod_time < total_time * 0.3:
+        elif prod_time < total_time * thresholds['low_productivity']:
             recommendations.append("💪 Try setting specific focus hours for deep work")
     
     # Digital wellness recommendations
-    if 'Entertainment' in category_usage and category_usage['Entertainment'] > total_time * 0.4:
+    if 'Entertainment' in category_usage and category_usage['Entertainment'] > total_time * thresholds['entertainment']:
         recommendations.append("⏰ Use app timers to maintain balanced screen time")
         recommendations.append("🌟 Schedule specific entertainment time slots")
     
     # Communication optimization
-    if 'Communication' in category_usage and category_usage['Communication'] > total_time * 0.3:
+    if 'Communication' in category_usage and category_usage['Communication'] > total_time * thresholds['communication']:
         recommendations.append("📧 Set specific times for checking emails and messages")
         recommendations.append("🎯 Use 'Do Not Disturb' mode during focus periods")
     
     # Browser usage optimization
-    if 'Browsers' in category_usage and category_usage['Browsers'] > total_time * 0.5:
+    if 'Browsers' in category_usage and category_usage['Browsers'] > total_time * thresholds['browsers']:
         recommendations.append("🌐 Use browser extensions to block distracting websites")
         recommendations.append("📚 Try browser tab management techniques")
     
@@ -104,15 +99,16 @@ def generate_ai_recommendations(usage_data, total_time):
 from datetime import datetime
 from constants import BLUE_LIGHT_THRESHOLD, EVENING_HOUR_START, EVENING_HOUR_END
 
-def analyze_blue_light_usage(screen_time_data):
+def analyze_blue_light_usage(continuous_minutes):
     """
-    Analyze screen time data to suggest optimal times for enabling blue light filters.
+    Suggest enabling blue light filters from the current unbroken screen streak.
+
+    `continuous_minutes` may be None when the streak is unknown.
     """
     recommendations = []
-    total_time = screen_time_data['Time_Minutes'].sum()
     
-    # Check for prolonged screen time
-    if total_time > BLUE_LIGHT_THRESHOLD:
+    # Check for prolonged continuous screen time
+    if continuous_minutes is not None and continuous_minutes > BLUE_LIGHT_THRESHOLD:
         recommendations.append(
             "🕶️ Prolonged screen usage detected. Consider enabling a blue light filter to reduce eye strain."
         )
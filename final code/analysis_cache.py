@@ -0,0 +1,59 @@
+# analysis_cache.py
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+from constants import ANALYSIS_CACHE_SIZE
+
+def usage_fingerprint(*mappings):
+    """Content hash of the mappings (e.g. app totals, category totals, process counts) an analysis reads."""
+    digest = hashlib.blake2b(digest_size=16)
+    for mapping in mappings:
+        digest.update(repr(sorted(mapping.items())).encode())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+class AnalysisCache:
+    """
+    Thread-safe LRU of analysis results shared across reruns and sessions.
+
+    Entries are keyed by analysis name, a fingerprint of the data analysed and the
+    thresholds in effect. sync() drops everything once the data source reports a new
+    version, so results never outlive the samples they were computed from. Cached
+    results are shared and must not be modified by callers.
+    """
+
+    def __init__(self, max_entries=ANALYSIS_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def sync(self, version):
+        """Invalidate every entry if `version` differs from the one the cache was filled at."""
+        with self._lock:
+            if version != self.version:
+                self._entries.clear()
+                self.version = version
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_or_compute(self, key, compute, *args):
+        """Return the cached result for `key`, calling compute(*args) on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        result = compute(*args)
+        with self._lock:
+            self._entries[key] = result
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
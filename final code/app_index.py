@@ -0,0 +1,93 @@
+# app_index.py
+
+import re
+from collections import namedtuple
+
+from constants import APP_DISPLAY_NAMES, APP_CATEGORIES, IGNORED_APPS
+
+DEFAULT_CATEGORY = 'Other'
+DEFAULT_COLOR = '#95a5a6'
+# Unknown names whose category is remembered per index before the memo starts over
+UNKNOWN_CACHE_SIZE = 4096
+
+# Everything the app needs to know about a tracked application
+AppRecord = namedtuple('AppRecord', ['app_id', 'name', 'display_name', 'category', 'color'])
+
+class AppIndex:
+    """
+    Lookup index compiled once from constants.py.
+
+    Process names are matched case-insensitively through a dict keyed on the
+    lower-cased name, so every lookup in the sampling loop is O(1). Ignored apps
+    win over tracked ones when both lists name the same process.
+    """
+
+    def __init__(self, display_names, categories, ignored):
+        self.ignored = frozenset(name.lower() for name in ignored)
+        self._categories = categories
+        # One compiled alternation per category, tried in APP_CATEGORIES order, so the
+        # first category with any app name contained in the process name wins as before
+        self._patterns = tuple(
+            (category, re.compile('|'.join(re.escape(app.lower()) for app in info['apps'])))
+            for category, info in categories.items() if info['apps']
+        )
+        self._exact_display_names = dict(display_names)
+        self._unknown_categories = {}  # lower-cased untracked name -> category
+        self._by_name = {}
+        self.records = []  # indexed by app_id
+
+        for name, display_name in display_names.items():
+            key = name.lower()
+            if key in self._by_name or key in self.ignored:
+                continue
+            category = self._match_category(key)
+            record = AppRecord(len(self.records), name, display_name, category, self.category_color(category))
+            self.records.append(record)
+            self._by_name[key] = record
+
+        self.tracked = frozenset(self._by_name)
+
+    def _match_category(self, name_lower):
+        for category, pattern in self._patterns:
+            if pattern.search(name_lower):
+                return category
+        return DEFAULT_CATEGORY
+
+    def lookup(self, name):
+        """Return the AppRecord for a tracked process name, or None."""
+        return self._by_name.get(name.lower())
+
+    def is_ignored(self, name):
+        return name.lower() in self.ignored
+
+    def display_name(self, name):
+        """Friendly display name, preferring an exact-case entry in APP_DISPLAY_NAMES."""
+        display_name = self._exact_display_names.get(name)
+        if display_name is not None:
+            return display_name
+        record = self.lookup(name)
+        return record.display_name if record is not None else name
+
+    def categorize(self, name):
+        """Category of any application name, using the same substring rules as before."""
+        record = self.lookup(name)
+        if record is not None:
+            return record.category
+        return self._categorize_unknown(name.lower())
+
+    def _categorize_unknown(self, name_lower):
+        category = self._unknown_categories.get(name_lower)
+        if category is None:
+            if len(self._unknown_categories) >= UNKNOWN_CACHE_SIZE:
+                self._unknown_categories.clear()
+            category = self._unknown_categories[name_lower] = self._match_category(name_lower)
+        return category
+
+    def category_color(self, category):
+        return self._categories.get(category, {}).get('color', DEFAULT_COLOR)
+
+    def category_emoji(self, category):
+        return self._categories.get(category, {}).get('emoji', '📱')
+
+# Shared by tracker, utils, analysis and visualisation
+APP_INDEX = AppIndex(APP_DISPLAY_NAMES, APP_CATEGORIES, IGNORED_APPS)
@@ -0,0 +1,229 @@
+# benchmark.py
+"""
+Micro benchmarks for the tracker hot paths.
+
+Usage: python benchmark.py [scanner] [enrichment] [categorize] [render] [imports]
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+def _per_call_ms(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def bench_scanner(process_counts=(250, 500, 1000, 1500, 3000), ticks=20, churn=0.01):
+    """
+    Per-tick cost of a full process walk versus the cached ProcessScanner.
+
+    The process table is synthetic so its size can be varied, but every name lookup
+    goes through a real psutil call on this process so resolution cost is realistic.
+    """
+    import psutil
+    from process_sources import StaticProcessSource, get_process_source, PROCESS_SOURCES
+    from scanner import ProcessScanner
+
+    me = psutil.Process(os.getpid())
+
+    class CostedSource(StaticProcessSource):
+        def describe(self, pid):
+            with me.oneshot():
+                me.create_time()
+                me.name()
+            return super().describe(pid)
+
+    for count in process_counts:
+        source = CostedSource({pid: (float(pid), f"proc{pid}.exe", 1) for pid in range(1, count + 1)})
+        next_pid = [count + 1]
+
+        def full_walk():
+            return [source.describe(pid)[1] for pid in source.pids()]
+
+        scanner = ProcessScanner(source)
+        scanner.scan()  # warm the cache
+
+        def cached_tick():
+            # Replace a small fraction of processes each tick, like a real desktop
+            for pid in source.pids()[:max(1, int(count * churn))]:
+                del source.table[pid]
+                source.table[next_pid[0]] = (float(next_pid[0]), f"proc{next_pid[0]}.exe", 1)
+                next_pid[0] += 1
+            return list(scanner.names())
+
+        naive_ms = _per_call_ms(full_walk, ticks)
+        cached_ms = _per_call_ms(cached_tick, ticks)
+        print(f"{count:>6} processes: full walk {naive_ms:8.2f} ms/tick, "
+              f"cached {cached_ms:8.2f} ms/tick ({naive_ms / cached_ms:5.1f}x)")
+
+    # Live process table for reference: full resolution cost per backend, then cached
+    live_count = len(psutil.pids())
+    live_full = _per_call_ms(lambda: [p.info['name'] for p in psutil.process_iter(['pid', 'name'])], ticks)
+    print(f"live ({live_count} processes): process_iter {live_full:.2f} ms/tick")
+    for name in PROCESS_SOURCES:
+        try:
+            backend = get_process_source(name)
+        except (OSError, ValueError):
+            continue
+
+        def describe_all():
+            for pid in backend.pids():
+                try:
+                    backend.describe(pid)
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    pass
+
+        live = ProcessScanner(backend)
+        live.scan()
+        print(f"  {name:>7}: full {_per_call_ms(describe_all, ticks):.2f} ms/tick, "
+              f"cached {_per_call_ms(lambda: list(live.names()), ticks):.2f} ms/tick")
+
+def bench_enrichment(apps=10_000, consumers=7, repeat=5):
+    """
+    Categorizing a usage history once and sharing it, versus every consumer
+    copying the frame and re-running categorize_app row by row.
+    """
+    import pandas as pd
+    from constants import APP_DISPLAY_NAMES
+    from enrich import enrich_usage
+    from utils import categorize_app
+
+    known = list(APP_DISPLAY_NAMES)
+    names = [known[i % len(known)] if i % 3 else f"tool{i}.exe" for i in range(apps)]
+    frame = pd.DataFrame({
+        'Application': names,
+        'Display_Name': names,
+        'Time_Minutes': [(i % 97) / 3 for i in range(apps)],
+    })
+
+    def per_consumer():
+        for _ in range(consumers):
+            data = frame.copy()
+            data['Category'] = data['Application'].apply(categorize_app)
+            data.groupby('Category')['Time_Minutes'].sum()
+
+    def shared():
+        usage = enrich_usage(frame)
+        # Read it the way the dashboard's consumers do
+        for _ in range(consumers):
+            data = usage.frame
+            len(data)
+            usage.category_usage.get('Productivity', 0)
+            usage.apps_in('Productivity')['Application'].tolist()
+
+    before = _per_call_ms(per_consumer, repeat)
+    after = _per_call_ms(shared, repeat)
+    print(f"{apps} apps, {consumers} consumers: per-consumer {before:.1f} ms, "
+          f"shared enrichment {after:.1f} ms ({before / after:.1f}x)")
+
+def bench_categorize(rows=1_000_000, unique_names=500, repeat=3):
+    """Row-by-row Series.apply(categorize_app) versus categorize_series on a long column."""
+    import pandas as pd
+    from constants import APP_DISPLAY_NAMES
+    from enrich import categorize_series
+    from utils import categorize_app
+
+    known = list(APP_DISPLAY_NAMES)
+    pool = [known[i % len(known)] if i % 2 else f"helper{i}.exe" for i in range(unique_names)]
+    names = pd.Series([pool[i % unique_names] for i in range(rows)])
+
+    before = _per_call_ms(lambda: names.apply(categorize_app), repeat)
+    after = _per_call_ms(lambda: categorize_series(names), repeat)
+    print(f"{rows} rows, {unique_names} unique names: apply {before:.1f} ms, "
+          f"categorize_series {after:.1f} ms ({before / after:.1f}x)")
+
+def bench_render(apps=20, repeat=10):
+    """Drawing the dashboard chart on every rerun versus serving it from the render cache."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import pandas as pd
+    from constants import APP_DISPLAY_NAMES
+    from enrich import enrich_usage
+    from visualisation import plot_screen_time, render_screen_time_png, RenderCache
+
+    names = list(APP_DISPLAY_NAMES)[:apps]
+    usage = enrich_usage(pd.DataFrame({
+        'Application': names,
+        'Display_Name': names,
+        'Time_Minutes': [float(i + 1) for i in range(len(names))],
+    }))
+
+    def redraw():
+        plt.close(plot_screen_time(usage))
+
+    cache = RenderCache()
+    render_screen_time_png(usage, cache)  # warm the cache
+    before = _per_call_ms(redraw, repeat)
+    after = _per_call_ms(lambda: render_screen_time_png(usage, cache), repeat)
+    print(f"{len(names)} apps: redraw {before:.1f} ms, cached {after:.2f} ms ({before / after:.0f}x)")
+
+def import_time_report(module='main'):
+    """
+    Cold-start import cost of `module`, from `python -X importtime` in a fresh interpreter.
+
+    Returns (total_ms, direct, packages): `direct` lists (name, cumulative ms) for each
+    module `module` imports itself, and `packages` (name, self ms) summed per
+    top-level package. Anything already loaded by an earlier import is charged to
+    that earlier import only.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    # Lines come in post-order: a module's subtree is printed just before its own
+    # depth-0 line, so everything else (interpreter startup, e.g. site) is dropped
+    total_ms = 0.0
+    subtree = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        entry = (depth, name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000)
+        if depth > 0:
+            subtree.append(entry)
+            continue
+        if entry[1] == module:
+            total_ms = entry[3]
+            subtree.append(entry)
+            break
+        subtree = []
+
+    direct = sorted(((name, cumulative_ms) for depth, name, _, cumulative_ms in subtree if depth == 1),
+                    key=lambda item: item[1], reverse=True)
+    packages = {}
+    for _, name, self_ms, _ in subtree:
+        root = name.split('.')[0]
+        packages[root] = packages.get(root, 0.0) + self_ms
+    return total_ms, direct, sorted(packages.items(), key=lambda item: item[1], reverse=True)
+
+def bench_imports(module='main', top=15):
+    """Print the per-module import-time report; track the total as the cold-start metric."""
+    total_ms, direct, packages = import_time_report(module)
+    print(f"import {module}: {total_ms:.1f} ms")
+    print("  by direct import (cumulative):")
+    for name, ms in direct[:top]:
+        print(f"    {name:<30} {ms:8.1f} ms")
+    print("  by package (self):")
+    for name, ms in packages[:top]:
+        print(f"    {name:<30} {ms:8.1f} ms")
+
+BENCHMARKS = {
+    'scanner': bench_scanner,
+    'enrichment': bench_enrichment,
+    'categorize': bench_categorize,
+    'render': bench_render,
+    'imports': bench_imports,
+}
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        print(f"== {name} ==")
+        BENCHMARKS[name]()
@@ -0,0 +1,96 @@
+# blocker.py
+
+import time
+from collections import namedtuple
+
+import psutil
+
+from constants import PROCESS_SOURCE, BLOCKER_TERMINATE_TIMEOUT
+from process_sources import get_process_source
+from proc_events import get_process_monitor
+from scanner import ProcessScanner
+
+# Outcome of one enforcement cycle; the process lists hold (pid, name) pairs
+BlockReport = namedtuple('BlockReport', ['cycle', 'timestamp', 'matched', 'terminated', 'killed', 'failed'])
+
+# Cached and live create times of the same process may differ by rounding
+CREATE_TIME_TOLERANCE = 1.0
+
+class AppBlocker:
+    """
+    Closes every running process whose name is in a set of blocked app names.
+
+    Each enforce() call does one incremental process scan and matches every pid
+    against the whole set at once, so the cost does not grow with the number of
+    blocked apps. Matches are asked to exit in-process (SIGTERM on POSIX,
+    TerminateProcess on Windows); any still running after `terminate_timeout`
+    seconds are killed. enforce(pids) checks just the given pids, for reacting to
+    process start events without a scan; such checks do not count as cycles.
+    """
+
+    def __init__(self, blocked=(), scanner=None, terminate_timeout=BLOCKER_TERMINATE_TIMEOUT):
+        if scanner is None:
+            scanner = ProcessScanner(get_process_source(PROCESS_SOURCE), events=get_process_monitor())
+        self.scanner = scanner
+        self.terminate_timeout = terminate_timeout
+        self.cycles = 0
+        self.set_blocked(blocked)
+
+    def set_blocked(self, names):
+        """Replace the blocked set; names match case-insensitively."""
+        self.blocked = frozenset(name.lower() for name in names)
+
+    def _open(self, pid, create_time):
+        """psutil handle for `pid`, or None if the pid now belongs to a different process."""
+        proc = psutil.Process(pid)
+        if create_time is not None and abs(proc.create_time() - create_time) > CREATE_TIME_TOLERANCE:
+            return None
+        return proc
+
+    def _candidates(self, pids):
+        if pids is None:
+            return self.scanner.scan().items()
+        candidates = []
+        for pid in pids:
+            try:
+                candidates.append((pid, self.scanner.source.describe(pid)))
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return candidates
+
+    def enforce(self, pids=None):
+        """Run one enforcement cycle, over every process or just `pids`, and report what was closed."""
+        if pids is None:
+            self.cycles += 1
+        matched, terminated, killed, failed = [], [], [], []
+        names = {}  # psutil handle -> name
+
+        if self.blocked:
+            for pid, (create_time, name, _) in self._candidates(pids):
+                if name is None or name.lower() not in self.blocked:
+                    continue
+                matched.append((pid, name))
+                try:
+                    proc = self._open(pid, create_time)
+                    if proc is None:
+                        continue
+                    proc.terminate()
+                    names[proc] = name
+                except psutil.NoSuchProcess:
+                    continue
+                except psutil.AccessDenied:
+                    failed.append((pid, name))
+
+        if names:
+            gone, alive = psutil.wait_procs(list(names), timeout=self.terminate_timeout)
+            terminated.extend((proc.pid, names[proc]) for proc in gone)
+            for proc in alive:
+                try:
+                    proc.kill()
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    pass  # whatever is still running below counts as failed
+            gone, alive = psutil.wait_procs(alive, timeout=self.terminate_timeout)
+            killed.extend((proc.pid, names[proc]) for proc in gone)
+            failed.extend((proc.pid, names[proc]) for proc in alive)
+
+        return BlockReport(self.cycles, time.time(), matched, terminated, killed, failed)
@@ -4,18 +4,21 @@ import datetime
 import pickle
 import pandas as pd
 import numpy as np
-import altair as alt
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+# altair and the Google client libraries are imported where they are first needed,
+# so the dashboard does not pay for them until a calendar is connected
 
 # Define the scopes
 SCOPES = ['https://www.googleapis.com/auth/calendar']
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
 
 def get_calendar_service():
     """
     Gets authenticated Google Calendar service.
     """
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    from google.auth.transport.requests import Request
+    from googleapiclient.discovery import build
+    
     creds = None
     # The file token.pickle stores the user's access and refresh tokens
     if os.path.exists('token.pickle'):
@@ -40,32 +43,37 @@ def get_calendar_service():
     service = build('calendar', 'v3', credentials=creds)
     return service
 
+def event_start_frame(events_data):
+    """
+    Parse every event start in one vectorized pass.
+
+    Returns a DataFrame with the event's calendar `date` and start `hour`, both as
+    written in the event's own time zone; `hour` is NaN for all-day events.
+    """
+    starts = pd.Series([event['start'].get('dateTime', event['start'].get('date')) for event in events_data],
+                       dtype=object)
+    # ISO 8601 starts with the local date and time, so slicing needs no per-event parsing
+    return pd.DataFrame({
+        'date': pd.to_datetime(starts.str[:10], format='%Y-%m-%d'),
+        'hour': pd.to_numeric(starts.str[11:13], errors='coerce')
+    })
+
 def create_calendar_heatmap(events_data, start_date, end_date):
     """
     Create a calendar heatmap visualization of events.
     """
+    import altair as alt
+    
     # Create date range
     date_range = pd.date_range(start=start_date, end=end_date)
     
-    # Create a DataFrame with dates
+    # Count events per day in one groupby, then fill in the days without events
+    counts = event_start_frame(events_data).groupby('date').size()
     calendar_df = pd.DataFrame({
         'date': date_range,
-        'count': 0
+        'count': counts.reindex(date_range.normalize(), fill_value=0).values
     })
     
-    # Count events per day
-    for event in events_data:
-        start = event['start'].get('dateTime', event['start'].get('date'))
-        if 'T' in start:  # This is a dateTime
-            event_date = datetime.datetime.fromisoformat(start.replace('Z', '+00:00')).date()
-        else:  # This is a date
-            event_date = datetime.datetime.strptime(start, "%Y-%m-%d").date()
-        
-        # Increment count for the day
-        idx = calendar_df[calendar_df['date'].dt.date == event_date].index
-        if len(idx) > 0:
-            calendar_df.loc[idx, 'count'] += 1
-    
     # Add day and month for grouping
     calendar_df['day'] = calendar_df['date'].dt.day_name()
     calendar_df['month'] = calendar_df['date'].dt.month_name()
@@ -73,7 +81,7 @@ def create_calendar_heatmap(events_data, start_date, end_date):
     # Create heatmap with Altair
     heatmap = alt.Chart(calendar_df).mark_rect().encode(
         x=alt.X('date:O', title='Date', axis=alt.Axis(labelAngle=-45)),
-        y=alt.Y('day:O', title='Day', sort=['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']),
+        y=alt.Y('day:O', title='Day', sort=WEEKDAYS),
         color=alt.Color('count:Q', scale=alt.Scale(scheme='blues'), legend=alt.Legend(title='Event Count')),
         tooltip=['date', 'day', 'count']
     ).properties(
@@ -84,6 +92,31 @@ def create_calendar_heatmap(events_data, start_date, end_date):
     
     return heatmap
 
+def create_hourly_heatmap(events_data):
+    """
+    Create an hour-of-day by weekday heatmap of timed events; all-day events are skipped.
+    """
+    import altair as alt
+    
+    starts = event_start_frame(events_data).dropna(subset=['hour'])
+    counts = pd.crosstab(starts['date'].dt.day_name(), starts['hour'].astype(int))
+    # Every weekday/hour cell is drawn, including the empty ones
+    counts = counts.reindex(index=WEEKDAYS, columns=range(24), fill_value=0)
+    hourly_df = counts.rename_axis(index='day', columns='hour').stack().rename('count').reset_index()
+    
+    heatmap = alt.Chart(hourly_df).mark_rect().encode(
+        x=alt.X('hour:O', title='Hour of Day'),
+        y=alt.Y('day:O', title='Day', sort=WEEKDAYS),
+        color=alt.Color('count:Q', scale=alt.Scale(scheme='blues'), legend=alt.Legend(title='Event Count')),
+        tooltip=['day', 'hour', 'count']
+    ).properties(
+        width=800,
+        height=300,
+        title='Events by Hour and Weekday'
+    )
+    
+    return heatmap
+
 def fetch_events(service, start_datetime, end_datetime, max_results=10):
     """
     Fetch events from Google Calendar within a specified date range.
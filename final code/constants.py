@@ -6,6 +6,53 @@ EVENING_HOUR_START = 18  # 6 PM
 EVENING_HOUR_END = 22  # 10 PM
 NOTIFICATION_THRESHOLD = 30  # seconds
 NOTIFICATION_COOLDOWN = 10  # seconds
+PROCESS_SOURCE = 'auto'  # 'psutil', 'procfs' (Linux only) or 'auto'
+IDLE_SOURCE = 'auto'  # 'windows', 'x11', 'none' or 'auto'
+EYE_BREAK_MIN_SECONDS = 2 * 60  # input idle gap that counts as a break from the screen
+NOTIFICATION_BACKEND = 'plyer'  # 'plyer' or 'null' for headless runs
+USAGE_DB_PATH = 'screen_time.db'  # local SQLite history
+STORE_FLUSH_INTERVAL = 10  # seconds between batched writes
+RING_BUFFER_PATH = 'screen_time.ring'  # live samples shared with dashboard sessions
+RING_BUFFER_CAPACITY = 3600 * 32  # one hour of 1 Hz samples for up to 32 apps
+RENDER_CACHE_SIZE = 32  # rendered charts kept in memory
+LIVE_REFRESH_SECONDS = 1.0  # cadence of the self-refreshing live panels
+ANALYSIS_CACHE_SIZE = 64  # analysis results kept across reruns
+CONTEXT_SWITCH_RATE_THRESHOLD = 5  # switches per hour before suggesting timeboxing
+PROD_TO_ENT_RATE_THRESHOLD = 2  # productivity-to-entertainment switches per hour
+USAGE_PATTERN_THRESHOLDS = {  # shares of total screen time, and minutes for a long day
+    'low_productivity': 0.3,
+    'high_productivity': 0.7,
+    'entertainment': 0.4,
+    'communication': 0.3,
+    'long_day_minutes': 120
+}
+WELLBEING_THRESHOLDS = {  # shares of total screen time, and apps before switching counts against the score
+    'entertainment': 0.5,
+    'productivity': 0.8,
+    'balanced_productivity': 0.7,
+    'max_apps': 10
+}
+RECOMMENDATION_THRESHOLDS = {  # shares of total screen time
+    'high_productivity': 0.7,
+    'low_productivity': 0.3,
+    'entertainment': 0.4,
+    'communication': 0.3,
+    'browsers': 0.5
+}
+BLOCKER_INTERVAL = 5  # seconds between app blocker enforcement cycles
+BLOCKER_TERMINATE_TIMEOUT = 3  # seconds a blocked app gets to exit before it is killed
+BLOCKER_REPORT_HISTORY = 100  # enforcement cycle reports kept for the dashboard
+PROCESS_EVENTS = 'auto'  # 'connector' (Linux proc connector), 'procdiff', 'off' or 'auto'
+PROC_DIFF_INTERVAL = 0.25  # seconds between /proc pid list diffs when the connector is unavailable
+PROCESS_RESYNC_INTERVAL = 60  # seconds between full rescans of an event-driven process scanner
+PROCESS_EVENT_BACKLOG = 4096  # unscanned pid changes held before a scanner falls back to a full rescan
+USAGE_NOTIFICATION_COOLDOWN = 15 * 60  # seconds between usage alerts for the same app
+BLUE_LIGHT_NOTIFICATION_COOLDOWN = 60 * 60  # seconds
+NOTIFICATION_COOLDOWNS = {  # per notification kind, in seconds
+    'usage': USAGE_NOTIFICATION_COOLDOWN,
+    'blue_light': BLUE_LIGHT_NOTIFICATION_COOLDOWN,
+    'eye_break': BLUE_LIGHT_THRESHOLD * 60
+}
 IGNORED_APPS = ['svchost.exe', 'System Idle Process', 'explorer.exe', 'Registry', 
                 'csrss.exe', 'wininit.exe', 'Conhost.exe', 'RuntimeBroker.exe']
 
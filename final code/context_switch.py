@@ -0,0 +1,97 @@
+# context_switch.py
+
+from collections import defaultdict
+
+from utils import categorize_app
+
+# Upper bounds (seconds) of the dwell-time histogram buckets
+DWELL_BUCKETS = (60, 5 * 60, 15 * 60, 30 * 60, 60 * 60, float('inf'))
+DWELL_LABELS = ('<1 min', '1-5 min', '5-15 min', '15-30 min', '30-60 min', '60+ min')
+
+class ContextSwitchAnalyzer:
+    """
+    Streaming context-switch statistics over the usage timeline.
+
+    Feed usage intervals in start order. The category of the most recently started
+    interval is taken as the current context; whenever a new interval starts in a
+    different category that counts as a switch. Every event updates the category
+    transition matrix, per-hour switch counts and per-category dwell-time histogram
+    in O(1).
+    """
+
+    def __init__(self):
+        self.transitions = defaultdict(int)  # (from_category, to_category) -> count
+        self.switches_by_hour = defaultdict(int)  # hour start timestamp -> count
+        self.dwell = defaultdict(lambda: [0] * len(DWELL_BUCKETS))  # category -> bucket counts
+        self.switches = 0
+        self.prod_to_ent_switches = 0
+        self.first_start = None
+        self.last_end = None
+        self._current = None
+        self._since = None
+        self._last_key = None  # (start, app) of the last interval consumed
+
+    def add(self, interval):
+        """
+        Consume one interval.
+
+        Intervals at or before the last one seen only extend the observed span, so a
+        re-fetched open interval that has grown since is still accounted for.
+        """
+        self.last_end = interval.end if self.last_end is None else max(self.last_end, interval.end)
+        key = (interval.start, interval.app)
+        if self._last_key is not None and key <= self._last_key:
+            return
+        self._last_key = key
+
+        if self.first_start is None:
+            self.first_start = interval.start
+
+        category = categorize_app(interval.app)
+        if self._current is None:
+            self._current, self._since = category, interval.start
+            return
+        if category == self._current:
+            return
+
+        self.switches += 1
+        self.transitions[(self._current, category)] += 1
+        self.switches_by_hour[interval.start - interval.start % 3600] += 1
+        if self._current == 'Productivity' and category == 'Entertainment':
+            self.prod_to_ent_switches += 1
+        self._record_dwell(self._current, interval.start - self._since)
+        self._current, self._since = category, interval.start
+
+    def feed(self, intervals):
+        for interval in intervals:
+            self.add(interval)
+        return self
+
+    def _record_dwell(self, category, seconds):
+        for i, bound in enumerate(DWELL_BUCKETS):
+            if seconds < bound:
+                self.dwell[category][i] += 1
+                return
+
+    @property
+    def resume_from(self):
+        """Timestamp to fetch further intervals from."""
+        return self._last_key[0] if self._last_key is not None else 0.0
+
+    @property
+    def hours_observed(self):
+        if self.first_start is None:
+            return 0.0
+        return max(self.last_end - self.first_start, 0.0) / 3600
+
+    def switch_rate(self):
+        """Average switches per hour over the observed timeline."""
+        # Less than an hour of data is reported as-is rather than extrapolated
+        return self.switches / max(self.hours_observed, 1.0)
+
+    def transition_matrix(self):
+        """Nested dict: from_category -> to_category -> count."""
+        matrix = defaultdict(dict)
+        for (source, target), count in self.transitions.items():
+            matrix[source][target] = count
+        return dict(matrix)
@@ -2,12 +2,12 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.colors as mcolors
 from datetime import datetime, timedelta
 import time
 
 def render_energy_wheel():
+    import matplotlib.pyplot as plt  # deferred so importing this module stays cheap
+    
     # Initialize session state variables if not already present
     if 'tasks' not in st.session_state:
         st.session_state.tasks = []
@@ -0,0 +1,69 @@
+# enrich.py
+
+import numpy as np
+import pandas as pd
+
+from constants import APP_CATEGORIES
+from app_index import DEFAULT_CATEGORY
+from utils import categorize_app, get_display_name, get_category_color
+
+CATEGORY_DTYPE = pd.CategoricalDtype(list(APP_CATEGORIES) + [DEFAULT_CATEGORY])
+CATEGORY_CODES = {category: code for code, category in enumerate(CATEGORY_DTYPE.categories)}
+
+def categorize_series(names):
+    """
+    Vectorized categorize_app() for a column of application names.
+
+    Each distinct name is categorized once (categorize_app is itself memoized, with
+    an exact-match fast path) and the resulting category codes are broadcast back
+    over the column, so the cost scales with unique names rather than rows.
+    """
+    codes, uniques = pd.factorize(names)
+    # The extra trailing entry maps factorize's -1 (missing name) to 'Other'
+    category_codes = np.array([CATEGORY_CODES[categorize_app(name)] for name in uniques] +
+                              [CATEGORY_CODES[DEFAULT_CATEGORY]], dtype=np.int8)
+    return pd.Series(pd.Categorical.from_codes(category_codes[codes], dtype=CATEGORY_DTYPE),
+                     index=names.index, name='Category')
+
+class EnrichedUsage:
+    """
+    Usage frame categorized once and shared by every analysis function.
+
+    `frame` carries Category (Categorical), Display_Name and Color columns next to
+    the original usage columns, and `category_usage` holds the minutes per category.
+    Both are handed out as-is and are read-only: instances are shared across
+    sessions through the analysis cache, so a consumer that needs to change
+    either takes its own copy first.
+    """
+
+    __slots__ = ('frame', 'category_usage', 'total_time')
+
+    def __init__(self, frame, category_usage, total_time):
+        self.frame = frame
+        self.category_usage = category_usage
+        self.total_time = total_time
+
+    def apps_in(self, category):
+        """Rows of the frame belonging to `category`, as a new frame."""
+        return self.frame[self.frame['Category'] == category]
+
+def enrich_usage(screen_time_data, category_usage=None):
+    """
+    Build the shared EnrichedUsage for a usage frame.
+
+    `category_usage` (minutes per category, e.g. from the store rollups) is used
+    as-is instead of grouping the frame.
+    """
+    frame = screen_time_data.copy()
+    frame['Category'] = categorize_series(frame['Application'])
+    if 'Display_Name' not in frame:
+        frame['Display_Name'] = frame['Application'].map(get_display_name)
+    frame['Color'] = frame['Category'].map(get_category_color).astype(str)
+
+    if category_usage is None:
+        category_usage = frame.groupby('Category', observed=True)['Time_Minutes'].sum()
+    return EnrichedUsage(frame, category_usage, frame['Time_Minutes'].sum())
+
+def as_enriched(usage):
+    """Accept either a raw usage frame or an EnrichedUsage."""
+    return usage if isinstance(usage, EnrichedUsage) else enrich_usage(usage)
@@ -0,0 +1,132 @@
+# goals.py
+
+import sqlite3
+import threading
+import time
+
+from constants import USAGE_DB_PATH
+from rollups import bucket_start, split_by_bucket
+from utils import categorize_app
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS goal_ledger_entries (
+    session_id TEXT NOT NULL,
+    app TEXT NOT NULL,
+    start REAL NOT NULL,
+    counted_end REAL NOT NULL,
+    PRIMARY KEY (session_id, app, start)
+);
+CREATE TABLE IF NOT EXISTS goal_weekly_totals (
+    week_start REAL NOT NULL,
+    category TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (week_start, category)
+);
+CREATE TABLE IF NOT EXISTS goal_targets (
+    category TEXT PRIMARY KEY,
+    target_hours REAL NOT NULL
+);
+"""
+
+SELECT_ENTRY = "SELECT counted_end FROM goal_ledger_entries WHERE session_id = ? AND app = ? AND start = ?"
+UPSERT_ENTRY = """
+INSERT INTO goal_ledger_entries (session_id, app, start, counted_end) VALUES (?, ?, ?, ?)
+ON CONFLICT (session_id, app, start) DO UPDATE SET counted_end = excluded.counted_end
+"""
+ADD_WEEK_TOTAL = """
+INSERT INTO goal_weekly_totals (week_start, category, seconds) VALUES (?, ?, ?)
+ON CONFLICT (week_start, category) DO UPDATE SET seconds = seconds + excluded.seconds
+"""
+SELECT_WEEK_TOTALS = "SELECT category, seconds FROM goal_weekly_totals WHERE week_start = ?"
+# Intervals that stopped growing long ago are never replayed again
+PRUNE_ENTRIES = "DELETE FROM goal_ledger_entries WHERE counted_end < ?"
+UPSERT_TARGET = """
+INSERT INTO goal_targets (category, target_hours) VALUES (?, ?)
+ON CONFLICT (category) DO UPDATE SET target_hours = excluded.target_hours
+"""
+
+def week_start(ts=None):
+    """Timestamp of local midnight on the Monday of the week containing `ts`."""
+    return bucket_start('week', time.time() if ts is None else ts)
+
+class GoalLedger:
+    """
+    Persisted weekly goal ledger.
+
+    Usage is ingested as (session id, interval) pairs. The ledger remembers how much
+    of each interval it has already counted, so replaying the same interval, or a
+    longer version of a still-open one, only adds the new part. Per-week, per-category
+    running totals are updated in the same transaction, so a progress query is a
+    primary-key lookup no matter how much history has been recorded.
+
+    Once a week, entries for intervals that stopped growing before the previous
+    week are pruned, so the ledger does not grow with the length of the history.
+    """
+
+    def __init__(self, path=USAGE_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._pruned_week = None
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def ingest(self, session_id, intervals, conn=None):
+        """
+        Count each (session_id, interval) exactly once; returns the seconds added.
+
+        Pass `conn` to ingest inside a transaction the caller already has open on
+        the same database, e.g. the usage store's flush, so both commit together.
+        """
+        if conn is None:
+            with self._connection() as conn:
+                return self.ingest(session_id, intervals, conn)
+
+        current_week = week_start()
+        if current_week != self._pruned_week:
+            # Keep last week's entries: an interval still open across the boundary is replayed with them
+            conn.execute(PRUNE_ENTRIES, (week_start(current_week - 1),))
+            self._pruned_week = current_week
+        added = 0.0
+        for app, start, end in intervals:
+            row = conn.execute(SELECT_ENTRY, (session_id, app, start)).fetchone()
+            counted = row[0] if row is not None else start
+            if end <= counted:
+                continue
+            conn.execute(UPSERT_ENTRY, (session_id, app, start, end))
+            category = categorize_app(app)
+            for week, seconds in split_by_bucket('week', counted, end):
+                conn.execute(ADD_WEEK_TOTAL, (week, category, seconds))
+            added += end - counted
+        return added
+
+    def is_empty(self):
+        """True if nothing has ever been counted; pruned entries still count."""
+        return self._connection().execute("SELECT 1 FROM goal_weekly_totals LIMIT 1").fetchone() is None
+
+    def week_totals(self, week=None):
+        """Return category -> seconds for the week starting at `week` (default: this week)."""
+        week = week_start() if week is None else week
+        return dict(self._connection().execute(SELECT_WEEK_TOTALS, (week,)).fetchall())
+
+    def targets(self):
+        """Return category -> target hours saved by the user."""
+        return dict(self._connection().execute("SELECT category, target_hours FROM goal_targets").fetchall())
+
+    def set_target(self, category, target_hours):
+        with self._connection() as conn:
+            conn.execute(UPSERT_TARGET, (category, target_hours))
+
+    def clear(self):
+        """Forget all counted usage; saved targets are kept."""
+        with self._connection() as conn:
+            conn.execute("DELETE FROM goal_ledger_entries")
+            conn.execute("DELETE FROM goal_weekly_totals")
@@ -0,0 +1,149 @@
+# idle.py
+
+import ctypes
+import ctypes.util
+import os
+import sys
+
+from constants import EYE_BREAK_MIN_SECONDS
+
+class NullIdleSource:
+    """Fallback when the platform offers no input idle time; idle_seconds() returns None for unknown."""
+
+    name = 'none'
+
+    def idle_seconds(self):
+        return None
+
+class WindowsIdleSource:
+    """Seconds since the last keyboard or mouse input, from GetLastInputInfo."""
+
+    name = 'windows'
+
+    class _LastInputInfo(ctypes.Structure):
+        _fields_ = [('cbSize', ctypes.c_uint), ('dwTime', ctypes.c_uint)]
+
+    def __init__(self):
+        self._user32 = ctypes.windll.user32
+        self._kernel32 = ctypes.windll.kernel32
+        self._info = self._LastInputInfo()
+        self._info.cbSize = ctypes.sizeof(self._info)
+
+    def idle_seconds(self):
+        if not self._user32.GetLastInputInfo(ctypes.byref(self._info)):
+            return 0.0
+        # Both counters are 32-bit milliseconds and wrap after ~49 days
+        return ((self._kernel32.GetTickCount() - self._info.dwTime) & 0xFFFFFFFF) / 1000.0
+
+class X11IdleSource:
+    """Seconds since the last input on the X display, from the MIT-SCREEN-SAVER extension."""
+
+    name = 'x11'
+
+    class _ScreenSaverInfo(ctypes.Structure):
+        _fields_ = [('window', ctypes.c_ulong), ('state', ctypes.c_int), ('kind', ctypes.c_int),
+                    ('til_or_since', ctypes.c_ulong), ('idle', ctypes.c_ulong),
+                    ('eventMask', ctypes.c_ulong)]
+
+    def __init__(self):
+        xlib_path = ctypes.util.find_library('X11')
+        xss_path = ctypes.util.find_library('Xss')
+        if xlib_path is None or xss_path is None:
+            raise OSError("libX11 or libXss not found")
+        self._xlib = ctypes.cdll.LoadLibrary(xlib_path)
+        self._xss = ctypes.cdll.LoadLibrary(xss_path)
+        self._xlib.XOpenDisplay.restype = ctypes.c_void_p
+        self._xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        self._xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+        self._xss.XScreenSaverAllocInfo.restype = ctypes.POINTER(self._ScreenSaverInfo)
+        self._xss.XScreenSaverQueryInfo.argtypes = [ctypes.c_void_p, ctypes.c_ulong,
+                                                    ctypes.POINTER(self._ScreenSaverInfo)]
+        self._display = self._xlib.XOpenDisplay(None)
+        if not self._display:
+            raise OSError("cannot open X display")
+        self._root = self._xlib.XDefaultRootWindow(self._display)
+        self._info = self._xss.XScreenSaverAllocInfo()
+
+    def idle_seconds(self):
+        if not self._xss.XScreenSaverQueryInfo(self._display, self._root, self._info):
+            return 0.0
+        return self._info.contents.idle / 1000.0
+
+class FakeIdleSource:
+    """
+    Scripted idle time for tests.
+
+    Set `idle` to the seconds since the last simulated input, or None for unknown.
+    """
+
+    name = 'fake'
+
+    def __init__(self, idle=0.0):
+        self.idle = idle
+
+    def idle_seconds(self):
+        return self.idle
+
+IDLE_SOURCES = {
+    'none': NullIdleSource,
+    'windows': WindowsIdleSource,
+    'x11': X11IdleSource,
+}
+
+def get_idle_source(name='auto'):
+    """Create an idle source by name; 'auto' picks the platform's and falls back to 'none'."""
+    if name == 'auto':
+        if sys.platform == 'win32':
+            name = 'windows'
+        elif os.environ.get('DISPLAY'):
+            name = 'x11'
+        else:
+            name = 'none'
+        try:
+            return IDLE_SOURCES[name]()
+        except OSError:
+            return NullIdleSource()
+    try:
+        return IDLE_SOURCES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown idle source: {name}")
+
+class ScreenStreakDetector:
+    """
+    Tracks the current unbroken stretch of screen use.
+
+    Call update() once per tick with the current time and the input idle time. An
+    idle gap of at least `break_seconds`, or a gap that long between ticks (e.g. a
+    suspend), counts as a break and ends the streak; the next input starts a new
+    one. Each update is O(1).
+    """
+
+    def __init__(self, break_seconds=EYE_BREAK_MIN_SECONDS):
+        self.break_seconds = break_seconds
+        self.started_at = None  # start of the current streak, None while on a break
+        self.longest = 0.0
+        self.breaks = 0
+        self._last_update = None
+
+    def update(self, now, idle_seconds):
+        """Advance to `now`; returns the current streak length in seconds."""
+        gap = now - self._last_update if self._last_update is not None else 0.0
+        self._last_update = now
+
+        on_break = idle_seconds >= self.break_seconds
+        if self.started_at is not None and (on_break or gap >= self.break_seconds):
+            self.started_at = None
+            self.breaks += 1
+        if self.started_at is None and not on_break:
+            # The new streak began with the first input after the break
+            self.started_at = now - idle_seconds
+
+        streak = self.current(now)
+        self.longest = max(self.longest, streak)
+        return streak
+
+    def current(self, now):
+        """Length of the current streak at `now`, 0 while on a break."""
+        if self.started_at is None:
+            return 0.0
+        return max(now - self.started_at, 0.0)
@@ -0,0 +1,54 @@
+# intervals.py
+
+from collections import namedtuple
+
+UsageInterval = namedtuple('UsageInterval', ['app', 'start', 'end'])
+
+class IntervalEncoder:
+    """
+    Run-length encodes per-tick app presence into (app, start, end) intervals.
+
+    Consecutive ticks in which an app is running extend one open interval; the
+    interval is closed as soon as the app is missing from a tick, so the output
+    grows with state changes rather than with seconds.
+    """
+
+    # Ticks this far apart (seconds) are treated as a gap rather than a continuation
+    GAP_TOLERANCE = 0.5
+
+    def __init__(self):
+        self._open = {}  # app -> [start, end]
+
+    def update(self, ts, apps, credit):
+        """
+        Feed one tick: `apps` were running for the `credit` seconds ending at `ts`.
+
+        Returns the intervals closed by this tick.
+        """
+        closed = []
+        tick_start = ts - credit
+        for app in apps:
+            span = self._open.get(app)
+            if span is None:
+                self._open[app] = [tick_start, ts]
+            elif tick_start - span[1] > self.GAP_TOLERANCE:
+                # Credit was capped (stall or suspend); don't bridge the gap
+                closed.append(UsageInterval(app, span[0], span[1]))
+                self._open[app] = [tick_start, ts]
+            else:
+                span[1] = ts
+
+        for app in [app for app in self._open if app not in apps]:
+            start, end = self._open.pop(app)
+            closed.append(UsageInterval(app, start, end))
+        return closed
+
+    def open_intervals(self):
+        """Intervals still in progress, ending at the latest tick."""
+        return [UsageInterval(app, start, end) for app, (start, end) in self._open.items()]
+
+    def close_all(self):
+        """Close and return every open interval."""
+        closed = self.open_intervals()
+        self._open.clear()
+        return closed
@@ -1,355 +1,144 @@
-import psutil
 import time
+import numpy as np
 import pandas as pd
 import streamlit as st
-import matplotlib.pyplot as plt
-from plyer import notification
-from collections import defaultdict
 from datetime import datetime, timedelta
-import subprocess  # For app blocking
-import threading  # For running blocking in the background
 
 # Import energy.py functionality
 from energy import render_energy_wheel
 
 # Import calendar functionality from cal.py
-from cal import get_calendar_service, create_calendar_heatmap, fetch_events, group_events_by_date
+from cal import (get_calendar_service, create_calendar_heatmap, create_hourly_heatmap, fetch_events,
+                 group_events_by_date)
 
-# Constants
-NOTIFICATION_THRESHOLD = 30  # seconds
-NOTIFICATION_COOLDOWN = 10  # seconds
-IGNORED_APPS = ['svchost.exe', 'System Idle Process', 'explorer.exe', 'Registry', 
-                'csrss.exe', 'wininit.exe', 'Conhost.exe', 'RuntimeBroker.exe']
+# Background sampling lives outside the Streamlit request thread
+from sampler import ScreenTimeSampler
+from store import UsageStore
+from goals import GoalLedger
+from ringbuffer import SampleRing
+from app_index import APP_INDEX
 
-# Application display names with emojis
-APP_DISPLAY_NAMES = {
-    'chrome.exe': '🌐 Google Chrome',
-    'firefox.exe': '🦊 Firefox',
-    'msedge.exe': '🌐 Microsoft Edge',
-    'spotify.exe': '🎵 Spotify',
-    'Code.exe': '💻 Visual Studio Code',
-    'postgres.exe': '🐘 Postgres',
-    'discord.exe': '💬 Discord',
-    'slack.exe': '💼 Slack',
-    'teams.exe': '👥 Microsoft Teams',
-    'code.exe': '💻 VS Code',
-    'notepad.exe': '📝 Notepad',
-    'excel.exe': '📊 Excel',
-    'word.exe': '📄 Word',
-    'powerpoint.exe': '📺 PowerPoint',
-    'outlook.exe': '📧 Outlook',
-    'steam.exe': '🎮 Steam',
-    'vlc.exe': '🎥 VLC Media Player',
-    'photoshop.exe': '🎨 Photoshop',
-    'illustrator.exe': '✒️ Illustrator',
-    'zoom.exe': '🎥 Zoom',
-    'skype.exe': '💬 Skype',
-    'obs64.exe': '🎥 OBS Studio',
-    'winrar.exe': '📦 WinRAR',
-    '7zg.exe': '📦 7-Zip',
-    'telegram.exe': '✈️ Telegram',
-    'whatsapp.exe': '💬 WhatsApp',
-    'netflix.exe': '🎬 Netflix',
-    'conhost.exe':'✨ miscellanies ',
-    'GitHubDesktop.exe' : '🐈‍⬛ Github',
-    'stremio.exe' : '🍿Stremio'
-}
+from constants import (NOTIFICATION_THRESHOLD, NOTIFICATION_COOLDOWN,
+                       APP_DISPLAY_NAMES, APP_CATEGORIES, LIVE_REFRESH_SECONDS,
+                       CONTEXT_SWITCH_RATE_THRESHOLD, PROD_TO_ENT_RATE_THRESHOLD, USAGE_PATTERN_THRESHOLDS,
+                       WELLBEING_THRESHOLDS, RECOMMENDATION_THRESHOLDS)
+from utils import get_display_name, get_category_emoji
+from analysis import analyze_usage_patterns, generate_ai_recommendations
+from visualisation import render_screen_time_png
+from timeline import timeline_frame, category_area_frame, timeline_chart
+from enrich import as_enriched, enrich_usage
+from context_switch import ContextSwitchAnalyzer, DWELL_LABELS
+from policies import BlockScheduler, RECURRENCES
+from analysis_cache import AnalysisCache, usage_fingerprint
 
-# Enhanced application categories with more detailed classification
-APP_CATEGORIES = {
-    'Productivity': {
-        'apps': ['excel.exe', 'word.exe', 'powerpoint.exe', 'code.exe', 'notepad.exe'],
-        'emoji': '💼',
-        'color': '#2ecc71'
-    },
-    'Communication': {
-        'apps': ['teams.exe', 'slack.exe', 'outlook.exe', 'discord.exe', 'skype.exe', 'telegram.exe', 'whatsapp.exe'],
-        'emoji': '💬',
-        'color': '#3498db'
-    },
-    'Browsers': {
-        'apps': ['chrome.exe', 'firefox.exe', 'msedge.exe', 'opera.exe', 'safari.exe'],
-        'emoji': '🌐',
-        'color': '#9b59b6'
-    },
-    'Entertainment': {
-        'apps': ['spotify.exe', 'netflix.exe', 'steam.exe', 'vlc.exe', 'stremio.exe'],
-        'emoji': '🎮',
-        'color': '#e74c3c'
-    },
-    'Creative': {
-        'apps': ['photoshop.exe', 'illustrator.exe', 'obs64.exe'],
-        'emoji': '🎨',
-        'color': '#f1c40f'
-    }
+# Thresholds each cached analysis depends on, as part of its cache key
+CONTEXT_THRESHOLDS = (CONTEXT_SWITCH_RATE_THRESHOLD, PROD_TO_ENT_RATE_THRESHOLD)
+
+def thresholds_key(thresholds):
+    """Hashable form of a thresholds dict for an analysis cache key."""
+    return tuple(sorted(thresholds.items()))
+
+# Dashboard history ranges, in days before today
+USAGE_RANGES = {
+    "Today": 0,
+    "Last 7 days": 6,
+    "Last 30 days": 29
 }
 
-# Blue light filter settings
-BLUE_LIGHT_THRESHOLD = 30  # minutes of continuous screen time to suggest a break
-EVENING_HOUR_START = 18  # 6 PM
-EVENING_HOUR_END = 22  # 10 PM
+@st.cache_resource
+def get_ledger():
+    """Open the persisted weekly goal ledger once per server process."""
+    return GoalLedger()
 
-def get_display_name(app_name):
-    """Get the friendly display name for an application."""
-    return APP_DISPLAY_NAMES.get(app_name, app_name)
+@st.cache_resource
+def get_store():
+    """Open the local usage history once per server process."""
+    return UsageStore(ledger=get_ledger())
 
-def categorize_app(app_name):
-    """Categorize an application based on its name with enhanced matching."""
-    app_lower = app_name.lower()
-    for category, info in APP_CATEGORIES.items():
-        if any(app.lower() in app_lower for app in info['apps']):
-            return category
-    return 'Other'
+@st.cache_resource
+def get_sampler():
+    """Start the background sampler once per server process and share it across sessions."""
+    sampler = ScreenTimeSampler(interval=1.0, store=get_store(), ring=SampleRing(writable=True))
+    sampler.start()
+    return sampler
 
-def get_category_emoji(category):
-    """Get the emoji for a category."""
-    return APP_CATEGORIES.get(category, {}).get('emoji', '📱')
+@st.cache_resource
+def get_analysis_cache():
+    """Analysis results shared by every rerun and session of this server process."""
+    return AnalysisCache()
 
-last_notification = {}
-def send_notification(app_name, usage_time):
-    """Send smart notifications with context-aware messages."""
-    current_time = time.time()
-    if app_name not in last_notification or \
-       (current_time - last_notification.get(app_name, 0)) > NOTIFICATION_COOLDOWN:
-        
-        message = (f"You've been using {app_name} for {usage_time:.1f} sec.\n"
-                  f"Time for a quick break! 🎯")
-        
-        notification.notify(
-            title="⏰ Smart Screen Time Alert",
-            message=message,
-            timeout=10
-        )
-        last_notification[app_name] = current_time
+@st.cache_resource
+def get_block_scheduler():
+    """Start the single blocking worker once per server process."""
+    scheduler = BlockScheduler()
+    scheduler.start()
+    return scheduler
 
-def send_blue_light_notification():
-    """Send a notification to enable blue light filter."""
-    notification.notify(
-        title="🕶️ Blue Light Filter Suggestion",
-        message="It's evening time! Enable your blue light filter to reduce eye strain and improve sleep quality.",
-        timeout=10
-    )
+@st.cache_resource
+def get_ring_reader():
+    """Read-only mapping of the sampler's live ring buffer."""
+    get_sampler()  # make sure the writer has created the file
+    return SampleRing()
 
-def track_screen_time(duration=60):
-    """Track screen time usage with enhanced display names."""
-    screen_time = defaultdict(int)
-    start_time = time.time()
-    
-    while time.time() - start_time < duration:
-        for proc in psutil.process_iter(['pid', 'name']):
-            try:
-                name = proc.info['name']
-                if name in APP_DISPLAY_NAMES and name not in IGNORED_APPS:
-                    screen_time[name] += 1
-                    
-                    if screen_time[name] >= NOTIFICATION_THRESHOLD*60:
-                        send_notification(get_display_name(name), screen_time[name])
-                        
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
-        
-        # Check for blue light filter suggestion
-        current_hour = datetime.now().hour
-        if EVENING_HOUR_START <= current_hour < EVENING_HOUR_END:
-            send_blue_light_notification()
-            
-        time.sleep(1)
+def recent_activity_frame(ring, seconds=3600, interval=1.0):
+    """Minutes of activity per app for each minute of the last `seconds`, straight from the ring buffer."""
+    records = ring.latest(seconds, time.time())
+    if len(records) == 0:
+        return None
+    display_names = np.array([record.display_name for record in APP_INDEX.records])
+    activity = pd.DataFrame({
+        'Minute': pd.to_datetime(records['timestamp'] // 60 * 60, unit='s', utc=True)
+                    .tz_convert(datetime.now().astimezone().tzinfo).tz_localize(None),
+        'Application': display_names[records['app_id']]
+    })
+    return pd.crosstab(activity['Minute'], activity['Application']) * interval / 60
 
+def day_start(days_ago=0):
+    """Timestamp of local midnight `days_ago` days before today."""
+    midnight = datetime.combine(datetime.now().date(), datetime.min.time())
+    return (midnight - timedelta(days=days_ago)).timestamp()
+
+def usage_frame(screen_time, process_counts=None):
+    """Build the usage DataFrame the dashboard works with from a sampler snapshot."""
     df = pd.DataFrame(list(screen_time.items()), columns=["Application", "Time_Seconds"])
     df['Display_Name'] = df['Application'].apply(get_display_name)
     df['Time_Minutes'] = df['Time_Seconds'] / 60
+    df['Processes'] = df['Application'].map(process_counts or {}).fillna(0).astype(int)
     return df.sort_values('Time_Minutes', ascending=False).reset_index(drop=True)
 
-def plot_screen_time(data):
-    """Enhanced visualization of screen time usage."""
-    plt.style.use('default')  # Using default style instead of seaborn
-    
-    # Create figure with white background
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6), facecolor='white')
-    fig.patch.set_facecolor('white')
-    
-    # Prepare data for plotting
-    plot_data = data.head(8)
-    categories = plot_data['Application'].apply(categorize_app)
-    colors = [APP_CATEGORIES.get(cat, {}).get('color', '#95a5a6') for cat in categories]
-    
-    # Bar chart with category-based colors
-    ax1.set_facecolor('white')
-    bars = ax1.bar(plot_data['Display_Name'], plot_data['Time_Minutes'], color=colors)
-    ax1.set_xlabel("Applications", fontsize=10)
-    ax1.set_ylabel("Time (Minutes)", fontsize=10)
-    ax1.set_title("Top Applications Usage", fontsize=12, pad=20)
-    ax1.grid(True, linestyle='--', alpha=0.7)
-    plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45, ha='right')
-    
-    # Category distribution pie chart
-    ax2.set_facecolor('white')
-    category_data = data.copy()
-    category_data['Category'] = category_data['Application'].apply(categorize_app)
-    category_usage = category_data.groupby('Category')['Time_Minutes'].sum()
-    
-    colors = [APP_CATEGORIES.get(cat, {}).get('color', '#95a5a6') for cat in category_usage.index]
-    wedges, texts, autotexts = ax2.pie(category_usage, 
-                                      labels=category_usage.index,
-                                      colors=colors,
-                                      autopct='%1.1f%%',
-                                      startangle=90)
-    ax2.set_title("Time Distribution by Category", fontsize=12, pad=20)
-    
-    # Enhance text contrast
-    plt.setp(autotexts, size=8, weight="bold")
-    plt.setp(texts, size=9)
-    
-    plt.tight_layout()
-    return fig
-
-def analyze_usage_patterns(screen_time_data):
-    """Analyze usage patterns with more sophisticated insights."""
-    usage_data = screen_time_data.copy()
-    usage_data['Category'] = usage_data['Application'].apply(categorize_app)
-    category_usage = usage_data.groupby('Category')['Time_Minutes'].sum()
-    
-    insights = []
-    total_time = usage_data['Time_Minutes'].sum()
-    
-    if total_time > 0:
-        # Calculate advanced metrics
-        productivity_ratio = category_usage.get('Productivity', 0) / total_time
-        entertainment_ratio = (category_usage.get('Entertainment', 0) + 
-                             category_usage.get('Social Media', 0)) / total_time
-        communication_ratio = category_usage.get('Communication', 0) / total_time
-        
-        # Generate dynamic insights based on usage patterns
-        if productivity_ratio < 0.3:
-            insights.append({
-                'type': 'warning',
-                'message': "🎯 Low productivity detected. Consider using time-blocking techniques."
-            })
-        elif productivity_ratio > 0.7:
-            insights.append({
-                'type': 'info',
-                'message': "⚡ High productivity! Remember to take breaks to avoid burnout."
-            })
-            
-        if entertainment_ratio > 0.4:
-            insights.append({
-                'type': 'warning',
-                'message': "⚠️ High entertainment usage. Try setting specific leisure time windows."
-            })
-            
-        if communication_ratio > 0.3:
-            insights.append({
-                'type': 'info',
-                'message': "💬 Consider batching communication tasks to reduce context switching."
-            })
-            
-        # Time management insights
-        if total_time > 120:
-            insights.append({
-                'type': 'health',
-                'message': "🧘 Practice the 20-20-20 rule: Every 20 minutes, look 20 feet away for 20 seconds."
-            })
-    
-    return insights, category_usage
-
-def generate_ai_recommendations(usage_data, total_time):
-    """Generate personalized AI recommendations based on usage patterns."""
-    recommendations = []
-    
-    # Add category column before grouping
-    usage_data_with_category = usage_data.copy()
-    usage_data_with_category['Category'] = usage_data_with_category['Application'].apply(categorize_app)
-    category_usage = usage_data_with_category.groupby('Category')['Time_Minutes'].sum()
-    
-    # Work-life balance recommendations
-    if 'Productivity' in category_usage:
-        prod_time = category_usage['Productivity']
-        if prod_time > total_time * 0.7:
-            recommendations.append("🎯 Consider implementing regular break intervals using the Pomodoro Technique")
-        elif prod_time < total_time * 0.3:
-            recommendations.append("💪 Try setting specific focus hours for deep work")
-    
-    # Digital wellness recommendations
-    if 'Entertainment' in category_usage and category_usage['Entertainment'] > total_time * 0.4:
-        recommendations.append("⏰ Use app timers to maintain balanced screen time")
-        recommendations.append("🌟 Schedule specific entertainment time slots")
-    
-    # Communication optimization
-    if 'Communication' in category_usage and category_usage['Communication'] > total_time * 0.3:
-        recommendations.append("📧 Set specific times for checking emails and messages")
-        recommendations.append("🎯 Use 'Do Not Disturb' mode during focus periods")
-    
-    # Browser usage optimization
-    if 'Browsers' in category_usage and category_usage['Browsers'] > total_time * 0.5:
-        recommendations.append("🌐 Use browser extensions to block distracting websites")
-        recommendations.append("📚 Try browser tab management techniques")
-    
-    # Always include some general recommendations
-    default_recommendations = [
-        "🧘 Practice mindful computing by closing unnecessary applications",
-        "💡 Use the built-in blue light filter during evening hours",
-        "🎯 Set specific goals for each work session",
-        "⚡ Take regular micro-breaks (2 minutes every 30 minutes)"
-    ]
-    
-    # Combine specific and general recommendations
-    recommendations.extend(default_recommendations)
-    
-    # Return top 5 most relevant recommendations, ensuring we always have recommendations
-    return recommendations[:5] if recommendations else default_recommendations[:5]
-
-def analyze_blue_light_usage(screen_time_data):
-    """
-    Analyze screen time data to suggest optimal times for enabling blue light filters.
-    """
-    recommendations = []
-    total_time = screen_time_data['Time_Minutes'].sum()
-    
-    # Check for prolonged screen time
-    if total_time > BLUE_LIGHT_THRESHOLD:
-        recommendations.append(
-            "🕶️ Prolonged screen usage detected. Consider enabling a blue light filter to reduce eye strain."
-        )
-    
-    # Check if it's evening hours
-    current_hour = datetime.now().hour
-    if EVENING_HOUR_START <= current_hour < EVENING_HOUR_END:
-        recommendations.append(
-            "🌙 It's evening time! Enable your blue light filter to improve sleep quality."
-        )
-    
-    return recommendations
+def category_minutes(category_totals):
+    """Turn a category -> seconds mapping from the store into minutes per category."""
+    return pd.Series(category_totals, dtype=float) / 60
 
-def calculate_wellbeing_score(screen_time_data):
+def calculate_wellbeing_score(screen_time_data, thresholds=WELLBEING_THRESHOLDS):
     """Calculate a digital wellbeing score based on screen time patterns."""
     score = 100  # Start with perfect score
     deductions = []
     
-    # Add category column
-    data = screen_time_data.copy()
-    data['Category'] = data['Application'].apply(categorize_app)
-    total_time = data['Time_Minutes'].sum()
+    usage = as_enriched(screen_time_data)
+    data = usage.frame
+    total_time = usage.total_time
     
     # Get category distribution
-    category_usage = data.groupby('Category')['Time_Minutes'].sum()
+    category_usage = usage.category_usage
     
     # Check for excessive entertainment usage
     entertainment_time = category_usage.get('Entertainment', 0) + category_usage.get('Social Media', 0)
     entertainment_ratio = entertainment_time / total_time if total_time > 0 else 0
-    if entertainment_ratio > 0.5:
+    if entertainment_ratio > thresholds['entertainment']:
         score -= min(30, int(entertainment_ratio * 60))
         deductions.append(f"High entertainment usage ({int(entertainment_ratio*100)}% of time)")
     
     # Check for work-life balance
     productivity_time = category_usage.get('Productivity', 0)
     productivity_ratio = productivity_time / total_time if total_time > 0 else 0
-    if productivity_ratio > 0.8:
-        score -= min(20, int((productivity_ratio-0.7) * 100))
+    if productivity_ratio > thresholds['productivity']:
+        score -= min(20, int((productivity_ratio - thresholds['balanced_productivity']) * 100))
         deductions.append("Excessive work focus without breaks")
     
     # Check for context switching
-    if len(data) > 10:
-        score -= min(15, (len(data) - 10) * 2)
+    if len(data) > thresholds['max_apps']:
+        score -= min(15, (len(data) - thresholds['max_apps']) * 2)
         deductions.append(f"Frequent application switching ({len(data)} apps)")
     
     # Determine score category
@@ -373,10 +162,9 @@ def calculate_wellbeing_score(screen_time_data):
         "deductions": deductions
     }
 
-def calculate_eye_strain_risk(screen_time_data):
-    """Calculate eye strain risk based on continuous screen time."""
-    # Calculate total continuous screen time
-    total_minutes = screen_time_data['Time_Minutes'].sum()
+def calculate_eye_strain_risk(continuous_minutes):
+    """Calculate eye strain risk from the minutes of unbroken screen use."""
+    total_minutes = continuous_minutes
     
     # Define risk levels
     if total_minutes < 30:
@@ -410,18 +198,13 @@ def generate_focus_session_plan(usage_data):
     Generate an intelligent focus session plan based on historical usage patterns.
     """
     # Calculate optimal work session length based on usage patterns
-    usage_data_with_category = usage_data.copy()
-    usage_data_with_category['Category'] = usage_data_with_category['Application'].apply(categorize_app)
+    usage = as_enriched(usage_data)
     
     # Identify user's productive apps
-    productive_apps = usage_data_with_category[
-        usage_data_with_category['Category'] == 'Productivity'
-    ]['Application'].tolist()
+    productive_apps = usage.apps_in('Productivity')['Application'].tolist()
     
     # Determine optimal session length (25-45 min) based on productivity patterns
-    productivity_time = usage_data_with_category[
-        usage_data_with_category['Category'] == 'Productivity'
-    ]['Time_Minutes'].sum()
+    productivity_time = usage.category_usage.get('Productivity', 0)
     
     if productivity_time > 60:
         optimal_session = 45  # Longer focus sessions for users who can maintain focus
@@ -431,9 +214,7 @@ def generate_focus_session_plan(usage_data):
         optimal_session = 25  # Shorter sessions for users who might struggle with focus
     
     # Determine optimal break length (5-15 min)
-    entertainment_ratio = usage_data_with_category[
-        usage_data_with_category['Category'] == 'Entertainment'
-    ]['Time_Minutes'].sum() / usage_data_with_category['Time_Minutes'].sum() if usage_data_with_category['Time_Minutes'].sum() > 0 else 0
+    entertainment_ratio = usage.category_usage.get('Entertainment', 0) / usage.total_time if usage.total_time > 0 else 0
     
     if entertainment_ratio > 0.4:
         optimal_break = 5  # Shorter breaks for users who tend to get distracted
@@ -455,43 +236,50 @@ def generate_focus_session_plan(usage_data):
     
     return session_plan
 
-def analyze_context_switching(screen_time_data):
+def range_timeline(store, range_start):
+    """Timeline bars and per-category minutes from `range_start` up to now, read from the store."""
+    intervals = store.intervals(range_start)
+    range_end = time.time()
+    return (timeline_frame(intervals, range_start, range_end),
+            category_area_frame(intervals, range_start, range_end))
+
+def update_context_analyzer(store, range_start):
+    """Feed intervals recorded since the last rerun into this session's context-switch analyzer."""
+    if st.session_state.get('context_range') != range_start:
+        st.session_state.context_analyzer = ContextSwitchAnalyzer()
+        st.session_state.context_range = range_start
+    analyzer = st.session_state.context_analyzer
+    start = max(analyzer.resume_from, range_start)
+    analyzer.feed(interval for interval in store.intervals(start) if interval.start >= range_start)
+    return analyzer
+
+def analyze_context_switching(analyzer):
     """
-    Analyze the pattern of application switches to identify context switching patterns.
+    Analyze the sequence of application switches to identify context switching patterns.
     """
-    # Get top apps used
-    apps_used = screen_time_data['Application'].tolist()
-    
-    # Simple context switching analysis (in a real app, this would use sequential data)
-    context_switches = 0
-    productivity_to_entertainment = 0
-    
-    for i in range(len(apps_used) - 1):
-        current_app_category = categorize_app(apps_used[i])
-        next_app_category = categorize_app(apps_used[i + 1])
-        
-        if current_app_category != next_app_category:
-            context_switches += 1
-            
-            if current_app_category == 'Productivity' and next_app_category == 'Entertainment':
-                productivity_to_entertainment += 1
+    # Thresholds apply to hourly rates so long ranges are comparable with short ones
+    switch_rate = analyzer.switch_rate()
+    prod_to_ent_rate = analyzer.prod_to_ent_switches / max(analyzer.hours_observed, 1.0)
     
     # Calculate impact score (0-100)
-    impact_score = min(100, context_switches * 10)
+    impact_score = min(100, int(switch_rate * 10))
     
     # Generate recommendations
     recommendations = []
-    if context_switches > 5:
+    if switch_rate > CONTEXT_SWITCH_RATE_THRESHOLD:
         recommendations.append("🔄 You're switching contexts frequently. Try timeboxing your work.")
-    if productivity_to_entertainment > 2:
+    if prod_to_ent_rate > PROD_TO_ENT_RATE_THRESHOLD:
         recommendations.append("⚠️ Productivity interruptions detected. Consider using app blockers during focus time.")
     
     recommendations.append("📱 Group similar tasks together to reduce mental load from switching.")
     
     return {
-        "switches": context_switches,
+        "switches": analyzer.switches,
+        "switch_rate": switch_rate,
         "impact_score": impact_score,
-        "prod_to_ent_switches": productivity_to_entertainment,
+        "prod_to_ent_switches": analyzer.prod_to_ent_switches,
+        "transitions": analyzer.transition_matrix(),
+        "dwell": {category: dict(zip(DWELL_LABELS, counts)) for category, counts in analyzer.dwell.items()},
         "recommendations": recommendations
     }
 
@@ -538,19 +326,16 @@ def create_weekly_goal_tracker():
     
     return default_goals
 
-def update_weekly_goals(goals, new_usage_data):
+def update_weekly_goals(goals, week_category_usage):
     """
-    Update weekly goals based on new usage data.
+    Update weekly goals from the minutes per category recorded so far this week.
     """
-    # In real app, this would store and persist data
-    usage_with_category = new_usage_data.copy()
-    usage_with_category['Category'] = usage_with_category['Application'].apply(categorize_app)
-    category_usage = usage_with_category.groupby('Category')['Time_Minutes'].sum() / 60  # Convert to hours
+    category_usage = week_category_usage / 60  # Convert to hours
     
     updated_goals = []
     for goal in goals:
         category = goal["category"]
-        current_hours = goal["current_hours"] + (category_usage.get(category, 0) if category in category_usage else 0)
+        current_hours = category_usage.get(category, 0)
         
         # Calculate progress percentage
         progress = min(100, int((current_hours / goal["target_hours"]) * 100)) if goal["target_hours"] > 0 else 0
@@ -630,7 +415,8 @@ def adjust_eye_care_routine(base_routine, screen_time_data):
     Dynamically adjust eye care routine based on screen time patterns.
     """
     adjusted_routine = base_routine.copy()
-    total_screen_time = screen_time_data['Time_Minutes'].sum()
+    usage = as_enriched(screen_time_data)
+    total_screen_time = usage.total_time
     
     # Adjust interval based on total screen time
     if total_screen_time > 90:  # Heavy screen use
@@ -640,71 +426,141 @@ def adjust_eye_care_routine(base_routine, screen_time_data):
         adjusted_routine["base_routine"]["interval_minutes"] = 30  # Less frequent breaks
     
     # Add specific recommendations based on categories
-    category_data = screen_time_data.copy()
-    category_data['Category'] = category_data['Application'].apply(categorize_app)
+    categories_used = set(usage.frame['Category'].unique())
     
     # If lots of creative work (which requires intense focus)
-    if 'Creative' in category_data['Category'].values:
+    if 'Creative' in categories_used:
         adjusted_routine["custom_reminders"].append(
             "Creative work detected: Take occasional 2-minute breaks to prevent eye strain during intense focus"
         )
     
     # If lots of reading (browsers, productivity apps)
-    if ('Browsers' in category_data['Category'].values or 
-        'Productivity' in category_data['Category'].values):
+    if ('Browsers' in categories_used or 
+        'Productivity' in categories_used):
         adjusted_routine["custom_reminders"].append(
             "Increase font size for reading to reduce eye strain"
         )
     
     return adjusted_routine
 
-def get_running_entertainment_apps():
-    """
-    Get a list of running entertainment apps.
+# Streamlit UI
+def live_fragment(active=True):
     """
-    entertainment_apps = APP_CATEGORIES['Entertainment']['apps']
-    running_apps = []
-    for proc in psutil.process_iter(['pid', 'name']):
-        if proc.info['name'].lower() in [app.lower() for app in entertainment_apps]:
-            running_apps.append(proc.info['name'])
-    return running_apps
+    Decorator for a panel that refreshes itself every LIVE_REFRESH_SECONDS while `active`.
 
-def block_app(app_name):
-    """
-    Block an app by killing its process.
+    Each refresh reruns only the decorated panel, not the whole script. Inactive
+    panels, and Streamlit versions without fragments, render once per app run.
     """
-    try:
-        for proc in psutil.process_iter(['pid', 'name']):
-            if proc.info['name'].lower() == app_name.lower():
-                subprocess.run(['taskkill', '/F', '/PID', str(proc.info['pid'])], shell=True)
-                print(f"Blocked {app_name}")
-                break
-        else:
-            print(f"{app_name} is not running.")
-    except Exception as e:
-        print(f"Failed to block {app_name}: {e}")
+    fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+    if fragment is None:
+        return lambda render: render
+    return fragment(run_every=LIVE_REFRESH_SECONDS if active else None)
 
-def block_apps_for_duration(apps_to_block, duration_minutes):
-    """
-    Block apps for a specified duration (in minutes).
-    """
-    end_time = time.time() + duration_minutes * 60
-    while time.time() < end_time:
-        for app in apps_to_block:
-            print(f"Attempting to block {app}...")
-            block_app(app)
-        time.sleep(5)  # Check every 5 seconds
+def render_live_monitor():
+    """Sampling status, current screen streak and the last hour of activity from the background sampler."""
+    sampler = get_sampler()
+    snapshot = sampler.snapshot()
+    st.caption(f"Sampling in the background since {datetime.fromtimestamp(snapshot.started_at).strftime('%I:%M %p')} "
+               f"({snapshot.ticks} samples, {snapshot.late_ticks} late, {snapshot.missed_ticks} missed)")
+    if snapshot.continuous_seconds is not None:
+        st.metric("Continuous screen time", f"{snapshot.continuous_seconds / 60:.1f} min")
+    else:
+        st.metric("Continuous screen time", "Unknown", help="Input idle time is not available on this platform")
 
-def start_blocking_thread(apps_to_block, duration_minutes):
-    """
-    Start a background thread to block apps.
-    """
-    thread = threading.Thread(target=block_apps_for_duration, args=(apps_to_block, duration_minutes))
-    thread.start()
-    return thread
+    recent = recent_activity_frame(get_ring_reader(), interval=sampler.interval)
+    if recent is not None:
+        st.markdown("#### Last hour")
+        st.area_chart(recent)
 
+def render_focus_timer():
+    """Running focus session and break timers."""
+    # Display active session timer if one is running
+    if 'show_timer' in st.session_state and st.session_state.show_timer:
+        st.markdown("---")
+        st.subheader("⏱️ Active Focus Session")
+
+        elapsed_time = (datetime.now() - st.session_state.session_start_time).total_seconds() / 60
+        remaining_time = max(0, st.session_state.active_session['duration'] - elapsed_time)
+
+        progress = min(1.0, elapsed_time / st.session_state.active_session['duration'])
+
+        st.progress(progress)
+        st.metric("Time Remaining", f"{remaining_time:.1f} min")
+
+        if remaining_time <= 0:
+            st.success(f"Session complete! Take a {st.session_state.active_session['break']} minute break.")
+            if st.button("Start Break Timer"):
+                st.session_state.break_start_time = datetime.now()
+                st.session_state.show_break_timer = True
+                st.session_state.show_timer = False
+
+        if st.button("End Session Early"):
+            st.session_state.show_timer = False
+            st.rerun()  # stop this panel's refresh
+
+    # Display break timer if one is running
+    if 'show_break_timer' in st.session_state and st.session_state.show_break_timer:
+        st.markdown("---")
+        st.subheader("☕ Break Time")
+
+        break_elapsed = (datetime.now() - st.session_state.break_start_time).total_seconds() / 60
+        break_remaining = max(0, st.session_state.active_session['break'] - break_elapsed)
+
+        break_progress = min(1.0, break_elapsed / st.session_state.active_session['break'])
+
+        st.progress(break_progress)
+        st.metric("Break Time Remaining", f"{break_remaining:.1f} min")
+
+        if break_remaining <= 0:
+            st.info("Break over! Ready to start your next session?")
+            if st.button("End Break"):
+                st.session_state.show_break_timer = False
+                st.rerun()  # stop this panel's refresh
+
+def render_eye_timer(interval, duration):
+    """Countdown to the next eye break."""
+    # Display active eye care timer if running
+    if 'eye_timer_active' in st.session_state and st.session_state.eye_timer_active:
+        snapshot = get_sampler().snapshot()
+        st.markdown("---")
+        st.subheader("⏱️ Eye Break Timer")
+
+        # A real break from the screen restarts the countdown just like a manual reset
+        timer_start = st.session_state.eye_timer_start.timestamp()
+        if snapshot.streak_started_at is not None:
+            timer_start = max(timer_start, snapshot.streak_started_at)
+        elapsed = (time.time() - timer_start) / 60
+        remaining = max(0, interval - elapsed)
+
+        st.progress(min(1.0, elapsed / interval))
+        st.metric("Next eye break in", f"{remaining:.1f} min")
+
+        if remaining <= 0:
+            st.success(f"Time for an eye break! Look 20 feet away for {duration} seconds.")
+            if st.button("Reset Timer"):
+                st.session_state.eye_timer_start = datetime.now()
+
+def render_exercise_timer():
+    """Running eye exercise timer."""
+    # Display exercise timer if active
+    if 'show_exercise_timer' in st.session_state and st.session_state.show_exercise_timer:
+        st.markdown("---")
+        st.subheader(f"⏱️ {st.session_state.active_exercise['name']} Exercise")
+
+        ex_elapsed = (datetime.now() - st.session_state.exercise_start_time).total_seconds()
+        ex_duration = st.session_state.active_exercise['duration_seconds']
+        ex_remaining = max(0, ex_duration - ex_elapsed)
+
+        st.progress(min(1.0, ex_elapsed / ex_duration))
+        st.metric("Time Remaining", f"{ex_remaining:.1f} sec")
+        st.markdown(f"**Instructions:** {st.session_state.active_exercise['description']}")
+
+        if ex_remaining <= 0:
+            st.success("Exercise complete!")
+            if st.button("End Exercise"):
+                st.session_state.show_exercise_timer = False
+                st.rerun()  # stop this panel's refresh
 
-# Streamlit UI
 def main():
     st.set_page_config(
         page_title="Smart Screen Time Tracker",
@@ -715,6 +571,31 @@ def main():
     st.title("📱 Smart Screen Time Tracker")
     st.markdown("### Monitor your digital wellness with AI-powered insights")
     
+    # Read the latest background sample and the stored history; this never blocks on tracking
+    store = get_store()
+    sampler = get_sampler()
+    snapshot = sampler.snapshot()
+    usage_range = st.sidebar.selectbox("Usage range", list(USAGE_RANGES))
+    range_start = day_start(USAGE_RANGES[usage_range])
+    # Stored totals only change when the store flushes, which invalidates every cached analysis
+    cache = get_analysis_cache()
+    cache.sync(store.version)
+    screen_time = cache.get_or_compute(('app_totals', range_start), store.app_totals, range_start)
+    if screen_time:
+        category_totals = cache.get_or_compute(('category_totals', range_start), store.category_totals, range_start)
+        fingerprint = usage_fingerprint(screen_time, category_totals, snapshot.process_counts)
+        # Categorize once per change in the data; every tab below shares the enriched usage
+        st.session_state.usage = cache.get_or_compute(
+            ('usage', fingerprint),
+            lambda: enrich_usage(usage_frame(screen_time, snapshot.process_counts), category_minutes(category_totals))
+        )
+        st.session_state.usage_fingerprint = fingerprint
+        st.session_state.screen_time_data = st.session_state.usage.frame
+    elif 'screen_time_data' in st.session_state:
+        del st.session_state.screen_time_data
+        del st.session_state.usage
+        del st.session_state.usage_fingerprint
+    
     # Create tabs for different features
     tabs = st.tabs([
         "📊 Dashboard", 
@@ -732,11 +613,8 @@ def main():
         
         with col1:
             st.subheader("Real-time Screen Time Monitoring")
-            if st.button("Start Tracking (1 Minute)"):
-                with st.spinner("Tracking your screen time..."):
-                    screen_time_data = track_screen_time(duration=60)  # 1 minute for demo
-                    st.session_state.screen_time_data = screen_time_data
-                    st.success("Tracking completed!")
+            # Refreshes on its own from the sampler snapshot; the rest of the page does not rerun
+            live_fragment()(render_live_monitor)()
             
             # Display data and visualizations if available
             if 'screen_time_data' in st.session_state:
@@ -748,23 +626,37 @@ def main():
                 st.metric("Total Screen Time", f"{total_time:.1f} minutes")
                 
                 # Display chart
-                fig = plot_screen_time(data)
-                st.pyplot(fig)
+                st.image(render_screen_time_png(st.session_state.usage), use_container_width=True)
+                
+                # Timeline over the selected range, downsampled server-side to the chart width
+                bars, category_area = cache.get_or_compute(
+                    ('timeline', store.version, range_start), range_timeline, store, range_start)
+                if bars is not None:
+                    st.markdown(f"### 🗓️ Timeline ({usage_range})")
+                    st.altair_chart(timeline_chart(bars), use_container_width=True)
+                    st.markdown("#### Minutes per category")
+                    st.area_chart(category_area)
                 
                 # Display raw data in expandable section
                 with st.expander("View detailed application usage"):
-                    st.dataframe(data[['Display_Name', 'Time_Minutes']].sort_values('Time_Minutes', ascending=False))
+                    st.dataframe(data[['Display_Name', 'Time_Minutes', 'Processes']].sort_values('Time_Minutes', ascending=False))
         
         with col2:
             st.subheader("AI Insights")
             
             if 'screen_time_data' in st.session_state:
                 data = st.session_state.screen_time_data
-                insights, category_usage = analyze_usage_patterns(data)
-                total_time = data['Time_Minutes'].sum()
+                usage = st.session_state.usage
+                fingerprint = st.session_state.usage_fingerprint
+                insights, category_usage = cache.get_or_compute(
+                    ('patterns', fingerprint, thresholds_key(USAGE_PATTERN_THRESHOLDS)),
+                    analyze_usage_patterns, usage, USAGE_PATTERN_THRESHOLDS)
+                total_time = usage.total_time
                 
                 # Display wellbeing score
-                wellbeing = calculate_wellbeing_score(data)
+                wellbeing = cache.get_or_compute(
+                    ('wellbeing', fingerprint, thresholds_key(WELLBEING_THRESHOLDS)),
+                    calculate_wellbeing_score, usage, WELLBEING_THRESHOLDS)
                 st.markdown(f"### Digital Wellbeing: <span style='color:{wellbeing['color']}'>{wellbeing['score']}/100</span>", unsafe_allow_html=True)
                 st.caption(f"Category: {wellbeing['category']}")
                 
@@ -774,23 +666,37 @@ def main():
                             st.markdown(f"- {deduction}")
                 
                 # Display eye strain risk
-                eye_strain = calculate_eye_strain_risk(data)
-                st.markdown(f"### Eye Strain Risk: <span style='color:{eye_strain['color']}'>{eye_strain['risk']}</span>", unsafe_allow_html=True)
-                st.caption(eye_strain['message'])
+                if snapshot.continuous_seconds is not None:
+                    eye_strain = calculate_eye_strain_risk(snapshot.continuous_seconds / 60)
+                    st.markdown(f"### Eye Strain Risk: <span style='color:{eye_strain['color']}'>{eye_strain['risk']}</span>", unsafe_allow_html=True)
+                    st.caption(eye_strain['message'])
+                else:
+                    st.markdown("### Eye Strain Risk: Unknown")
+                    st.caption("Screen breaks cannot be detected without input idle time on this platform.")
                 
                 # Context switching analysis
-                context_analysis = analyze_context_switching(data)
+                analyzer = update_context_analyzer(store, range_start)
+                context_analysis = cache.get_or_compute(
+                    ('context', range_start, analyzer.switches, analyzer.prod_to_ent_switches,
+                     analyzer.first_start, analyzer.last_end, CONTEXT_THRESHOLDS),
+                    analyze_context_switching, analyzer)
                 if context_analysis['switches'] > 0:
                     st.markdown(f"### Context Switching Score: {context_analysis['impact_score']}/100")
-                    st.caption(f"You switched between {context_analysis['switches']} different contexts")
+                    st.caption(f"You switched contexts {context_analysis['switches']} times "
+                               f"({context_analysis['switch_rate']:.1f} per hour)")
                     
                     with st.expander("Context switching recommendations"):
                         for rec in context_analysis['recommendations']:
                             st.markdown(f"- {rec}")
+                    
+                    with st.expander("Category transitions"):
+                        st.dataframe(pd.DataFrame(context_analysis['transitions']).fillna(0).astype(int).T)
                 
                 # Display personalized recommendations
                 st.markdown("### 💡 Smart Recommendations")
-                recommendations = generate_ai_recommendations(data, total_time)
+                recommendations = cache.get_or_compute(
+                    ('recommendations', fingerprint, total_time, thresholds_key(RECOMMENDATION_THRESHOLDS)),
+                    generate_ai_recommendations, usage, total_time, RECOMMENDATION_THRESHOLDS)
                 for rec in recommendations:
                     st.markdown(f"- {rec}")
     
@@ -801,7 +707,7 @@ def main():
         if 'screen_time_data' in st.session_state:
             # Generate focus session plan
             if 'focus_plan' not in st.session_state:
-                st.session_state.focus_plan = generate_focus_session_plan(st.session_state.screen_time_data)
+                st.session_state.focus_plan = generate_focus_session_plan(st.session_state.usage)
             
             # Display focus session plan
             for i, session in enumerate(st.session_state.focus_plan):
@@ -824,53 +730,11 @@ def main():
                     st.session_state.session_start_time = datetime.now()
                     st.session_state.show_timer = True
             
-            # Display active session timer if one is running
-            if 'show_timer' in st.session_state and st.session_state.show_timer:
-                st.markdown("---")
-                st.subheader("⏱️ Active Focus Session")
-                
-                elapsed_time = (datetime.now() - st.session_state.session_start_time).total_seconds() / 60
-                remaining_time = max(0, st.session_state.active_session['duration'] - elapsed_time)
-                
-                progress = min(1.0, elapsed_time / st.session_state.active_session['duration'])
-                
-                st.progress(progress)
-                st.metric("Time Remaining", f"{remaining_time:.1f} min")
-                
-                if remaining_time <= 0:
-                    st.success(f"Session complete! Take a {st.session_state.active_session['break']} minute break.")
-                    if st.button("Start Break Timer"):
-                        st.session_state.break_start_time = datetime.now()
-                        st.session_state.show_break_timer = True
-                        st.session_state.show_timer = False
-                
-                if st.button("End Session Early"):
-                    st.session_state.show_timer = False
-            
-            # Display break timer if one is running
-            if 'show_break_timer' in st.session_state and st.session_state.show_break_timer:
-                st.markdown("---")
-                st.subheader("☕ Break Time")
-                
-                break_elapsed = (datetime.now() - st.session_state.break_start_time).total_seconds() / 60
-                break_remaining = max(0, st.session_state.active_session['break'] - break_elapsed)
-                
-                break_progress = min(1.0, break_elapsed / st.session_state.active_session['break'])
-                
-                st.progress(break_progress)
-                st.metric("Break Time Remaining", f"{break_remaining:.1f} min")
-                
-                if break_remaining <= 0:
-                    st.info("Break over! Ready to start your next session?")
-                    if st.button("End Break"):
-                        st.session_state.show_break_timer = False
+            # The running timer refreshes on its own without rerunning the whole page
+            live_fragment(st.session_state.get('show_timer') or
+                          st.session_state.get('show_break_timer'))(render_focus_timer)()
         else:
-            st.info("Track your screen time first to generate personalized focus sessions.")
-            if st.button("Start Quick Track (30 seconds)"):
-                with st.spinner("Tracking your screen time for quick analysis..."):
-                    screen_time_data = track_screen_time(duration=30)  # 30 seconds for quick demo
-                    st.session_state.screen_time_data = screen_time_data
-                    st.success("Tracking completed!")
+            st.info("Screen time is being collected in the background. Check back shortly for personalized focus sessions.")
     
     with tabs[2]:  # Eye Care Tab
         st.subheader("👁️ Smart Eye Care")
@@ -884,7 +748,7 @@ def main():
         if 'screen_time_data' in st.session_state:
             st.session_state.eye_care_routine = adjust_eye_care_routine(
                 st.session_state.eye_care_routine, 
-                st.session_state.screen_time_data
+                st.session_state.usage
             )
         
         # Display routine settings
@@ -937,53 +801,29 @@ def main():
         for tip in st.session_state.eye_care_routine["custom_reminders"]:
             st.markdown(f"- {tip}")
         
-        # Display active eye care timer if running
-        if 'eye_timer_active' in st.session_state and st.session_state.eye_timer_active:
-            st.markdown("---")
-            st.subheader("⏱️ Eye Break Timer")
-            
-            elapsed = (datetime.now() - st.session_state.eye_timer_start).total_seconds() / 60
-            remaining = max(0, interval - elapsed)
-            
-            st.progress(min(1.0, elapsed / interval))
-            st.metric("Next eye break in", f"{remaining:.1f} min")
-            
-            if remaining <= 0:
-                st.success(f"Time for an eye break! Look 20 feet away for {duration} seconds.")
-                if st.button("Reset Timer"):
-                    st.session_state.eye_timer_start = datetime.now()
-        
-        # Display exercise timer if active
-        if 'show_exercise_timer' in st.session_state and st.session_state.show_exercise_timer:
-            st.markdown("---")
-            st.subheader(f"⏱️ {st.session_state.active_exercise['name']} Exercise")
-            
-            ex_elapsed = (datetime.now() - st.session_state.exercise_start_time).total_seconds()
-            ex_duration = st.session_state.active_exercise['duration_seconds']
-            ex_remaining = max(0, ex_duration - ex_elapsed)
-            
-            st.progress(min(1.0, ex_elapsed / ex_duration))
-            st.metric("Time Remaining", f"{ex_remaining:.1f} sec")
-            st.markdown(f"**Instructions:** {st.session_state.active_exercise['description']}")
-            
-            if ex_remaining <= 0:
-                st.success("Exercise complete!")
-                if st.button("End Exercise"):
-                    st.session_state.show_exercise_timer = False
+        # Running timers refresh on their own without rerunning the whole page
+        live_fragment(st.session_state.get('eye_timer_active'))(render_eye_timer)(interval, duration)
+        live_fragment(st.session_state.get('show_exercise_timer'))(render_exercise_timer)()
     
     with tabs[3]:  # Weekly Goals Tab
         st.subheader("📈 Weekly Screen Time Goals")
         st.markdown("Set and track your digital wellness goals with AI assistance")
         
-        # Initialize weekly goals if not exists
+        ledger = get_ledger()
+        
+        # Initialize weekly goals if not exists, applying any saved targets
         if 'weekly_goals' not in st.session_state:
+            saved_targets = ledger.targets()
             st.session_state.weekly_goals = create_weekly_goal_tracker()
+            for goal in st.session_state.weekly_goals:
+                goal["target_hours"] = saved_targets.get(goal["category"], goal["target_hours"])
         
-        # Update goals with new data if available
-        if 'screen_time_data' in st.session_state:
+        # Update goals with this week's running totals from the goal ledger
+        week_usage = ledger.week_totals()
+        if week_usage:
             st.session_state.weekly_goals = update_weekly_goals(
                 st.session_state.weekly_goals,
-                st.session_state.screen_time_data
+                category_minutes(week_usage)
             )
         
         # Display current day and estimated week progress
@@ -1028,6 +868,7 @@ def main():
                 )
                 
                 if st.button(f"Update {goal['category']} Goal"):
+                    ledger.set_target(goal["category"], new_target)
                     for i, g in enumerate(st.session_state.weekly_goals):
                         if g["category"] == goal["category"]:
                             st.session_state.weekly_goals[i]["target_hours"] = new_target
@@ -1146,6 +987,9 @@ def main():
             
             heatmap = create_calendar_heatmap(events, start_date, end_date)
             st.altair_chart(heatmap, use_container_width=True)
+            
+            st.markdown("When during the week your timed events start:")
+            st.altair_chart(create_hourly_heatmap(events), use_container_width=True)
 
     with tabs[6]:  # App Blocker Tab
         st.subheader("🚫 App Blocker")
@@ -1163,21 +1007,77 @@ def main():
             value=30
         )
 
-        # Start blocking
+        scheduler = get_block_scheduler()
+        
+        # Start blocking; repeated clicks merge into the running block instead of stacking
         if st.button("Block Entertainment Apps"):
             if not entertainment_apps:
                 st.warning("No entertainment apps found to block.")
             else:
-                st.session_state.blocking_thread = start_blocking_thread(entertainment_apps, duration_minutes)
+                now = time.time()
+                scheduler.schedule("Entertainment block", entertainment_apps, now, now + duration_minutes * 60)
                 st.success(f"Blocking {len(entertainment_apps)} entertainment apps for {duration_minutes} minutes...")
-
-        # Show currently blocked apps
-        if 'blocking_thread' in st.session_state and st.session_state.blocking_thread.is_alive():
+        
+        with st.expander("Schedule a block"):
+            policy_name = st.text_input("Policy name", "Focus hours")
+            policy_apps = st.multiselect("Apps to block", list(APP_DISPLAY_NAMES), default=entertainment_apps,
+                                         format_func=get_display_name)
+            policy_start = st.time_input("Start time", datetime.now().replace(second=0, microsecond=0).time())
+            policy_minutes = st.number_input("Duration (minutes)", min_value=1, max_value=24 * 60, value=60)
+            policy_repeat = st.selectbox("Repeat", ["Once"] + list(RECURRENCES))
+            if st.button("Schedule Block") and policy_apps:
+                start = datetime.combine(datetime.now().date(), policy_start)
+                if start + timedelta(minutes=policy_minutes) <= datetime.now():
+                    # Today's window is already over, so the block starts tomorrow
+                    start += timedelta(days=1)
+                policy = scheduler.schedule(policy_name, policy_apps, start.timestamp(),
+                                            start.timestamp() + policy_minutes * 60,
+                                            None if policy_repeat == "Once" else policy_repeat)
+                starts = datetime.fromtimestamp(policy.start).strftime('%a %I:%M %p')
+                st.success(f"Scheduled '{policy_name}' from {starts}")
+        
+        # Show currently blocked apps straight from the scheduler's published state
+        active = scheduler.active
+        if active:
             st.markdown("### Currently Blocked Apps")
-            for app in entertainment_apps:
-                st.markdown(f"- {APP_DISPLAY_NAMES.get(app, app)}")
+            for policy in active:
+                col1, col2, col3 = st.columns([3, 1, 1])
+                with col1:
+                    until = datetime.fromtimestamp(policy.end).strftime('%I:%M %p')
+                    st.markdown(f"**{policy.name}** (until {until}): "
+                                f"{', '.join(get_display_name(app) for app in sorted(policy.apps))}")
+                with col2:
+                    if st.button("+15 min", key=f"extend_{policy.name}", disabled=policy.end <= time.time()):
+                        if not scheduler.extend(policy.name, 15 * 60):
+                            st.warning(f"'{policy.name}' has already ended.")
+                        else:
+                            st.rerun()
+                with col3:
+                    if st.button("Cancel", key=f"cancel_{policy.name}"):
+                        scheduler.cancel(policy.name)
+                        st.rerun()
+            
+            st.caption(f"{scheduler.total_closed} processes closed so far, "
+                       f"{scheduler.closed_on_start} of them as they started")
+            if scheduler.reports:
+                report = scheduler.reports[-1]
+                closed = report.terminated + report.killed
+                st.caption(f"Last full check: {len(closed)} closed ({len(report.killed)} forcibly), "
+                           f"{len(report.failed)} could not be closed")
         else:
             st.info("No apps are currently being blocked.")
+        
+        upcoming = [policy for policy in scheduler.policies.values() if policy not in active]
+        if upcoming:
+            st.markdown("### Scheduled Blocks")
+            for policy in sorted(upcoming, key=lambda p: p.start):
+                starts = datetime.fromtimestamp(policy.start).strftime('%a %I:%M %p')
+                repeat = f", repeats {policy.recurrence}" if policy.recurrence else ""
+                st.markdown(f"- **{policy.name}** from {starts} for "
+                            f"{(policy.end - policy.start) / 60:.0f} min{repeat}")
+                if st.button("Cancel", key=f"cancel_upcoming_{policy.name}"):
+                    scheduler.cancel(policy.name)
+                    st.rerun()
 
     
     with tabs[7]:  # Settings Tab
@@ -1238,17 +1138,31 @@ def main():
         
         col1, col2 = st.columns(2)
         with col1:
-            if st.button("Export Data"):
-                st.info("Data export functionality would be here")
+            # The history is only read when the button is clicked, not on every rerun
+            st.download_button(
+                "Export Data",
+                data=store.export_csv,
+                file_name="screen_time_history.csv",
+                mime="text/csv"
+            )
         
         with col2:
             if st.button("Clear All Data"):
+                sampler.reset()
+                store.clear()
+                get_ledger().clear()
+                get_analysis_cache().invalidate()
                 if 'screen_time_data' in st.session_state:
                     del st.session_state.screen_time_data
+                    del st.session_state.usage
+                    del st.session_state.usage_fingerprint
                 if 'weekly_goals' in st.session_state:
                     del st.session_state.weekly_goals
                 if 'focus_plan' in st.session_state:
                     del st.session_state.focus_plan
+                if 'context_analyzer' in st.session_state:
+                    del st.session_state.context_analyzer
+                    del st.session_state.context_range
                 if 'eye_care_routine' in st.session_state:
                     del st.session_state.eye_care_routine
                     
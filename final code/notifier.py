@@ -0,0 +1,118 @@
+# notifier.py
+
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from constants import NOTIFICATION_BACKEND, NOTIFICATION_COOLDOWNS
+
+Notification = namedtuple('Notification', ['kind', 'key', 'title', 'message', 'timeout'])
+
+class PlyerBackend:
+    """Desktop notifications through plyer."""
+
+    def __init__(self):
+        from plyer import notification
+        self._notification = notification
+
+    def notify(self, note):
+        self._notification.notify(title=note.title, message=note.message, timeout=note.timeout)
+
+class NullBackend:
+    """Swallows notifications; keeps them in `sent` so tests can inspect them."""
+
+    def __init__(self):
+        self.sent = []
+
+    def notify(self, note):
+        self.sent.append(note)
+
+NOTIFICATION_BACKENDS = {
+    'plyer': PlyerBackend,
+    'null': NullBackend,
+}
+
+def get_notification_backend(name=NOTIFICATION_BACKEND):
+    """Create a backend by name, falling back to the null backend if plyer is unavailable."""
+    try:
+        return NOTIFICATION_BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown notification backend: {name}")
+    except ImportError:
+        return NullBackend()
+
+class NotificationDispatcher(threading.Thread):
+    """
+    Background worker that delivers notifications without blocking the caller.
+
+    submit() only touches an in-memory queue. Alerts with the same (kind, key)
+    that are still waiting are coalesced into the latest one, and each (kind, key)
+    is rate limited by the cooldown configured for its kind.
+    """
+
+    def __init__(self, backend=None, cooldowns=None, clock=time.monotonic):
+        super().__init__(name="notification-dispatcher", daemon=True)
+        self.backend = backend if backend is not None else get_notification_backend()
+        self.cooldowns = dict(NOTIFICATION_COOLDOWNS if cooldowns is None else cooldowns)
+        self._clock = clock
+        self._pending = OrderedDict()  # (kind, key) -> Notification
+        self._last_sent = {}  # (kind, key) -> clock time of last delivery
+        self._condition = threading.Condition()
+        self._stopped = False
+        self.sent = 0
+        self.coalesced = 0
+        self.suppressed = 0
+
+    def _cooling_down(self, slot, now):
+        last = self._last_sent.get(slot)
+        return last is not None and now - last < self.cooldowns.get(slot[0], 0)
+
+    def submit(self, kind, title, message, key=None, timeout=10):
+        """Queue a notification; returns False if it was dropped by its cooldown."""
+        slot = (kind, key)
+        with self._condition:
+            if self._cooling_down(slot, self._clock()):
+                self.suppressed += 1
+                return False
+            if slot in self._pending:
+                self.coalesced += 1
+            self._pending[slot] = Notification(kind, key, title, message, timeout)
+            self._condition.notify()
+        return True
+
+    def run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                slot, note = self._pending.popitem(last=False)
+                now = self._clock()
+                if self._cooling_down(slot, now):
+                    self.suppressed += 1
+                    continue
+                self._last_sent[slot] = now
+
+            try:
+                self.backend.notify(note)
+                self.sent += 1
+            except Exception as e:
+                print(f"Failed to send notification: {e}")
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+def get_dispatcher():
+    """Return the process-wide dispatcher, starting it on first use."""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = NotificationDispatcher()
+            _dispatcher.start()
+        return _dispatcher
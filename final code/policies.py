@@ -0,0 +1,207 @@
+# policies.py
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque, namedtuple
+from datetime import datetime, timedelta
+from types import MappingProxyType
+
+from constants import BLOCKER_INTERVAL, BLOCKER_REPORT_HISTORY
+from blocker import AppBlocker
+from proc_events import get_process_monitor
+
+# A named blocking window; `apps` is a frozenset of app names
+BlockPolicy = namedtuple('BlockPolicy', ['name', 'apps', 'start', 'end', 'recurrence'])
+
+# Recurrence -> days between occurrences, stepped on the local calendar so DST does not shift them
+RECURRENCES = {
+    'daily': 1,
+    'weekly': 7,
+}
+
+def next_occurrence(policy):
+    """The same policy moved to its next recurrence."""
+    days = timedelta(days=RECURRENCES[policy.recurrence])
+    start = (datetime.fromtimestamp(policy.start) + days).timestamp()
+    end = (datetime.fromtimestamp(policy.end) + days).timestamp()
+    return policy._replace(start=start, end=end)
+
+class BlockScheduler(threading.Thread):
+    """
+    One worker thread that serves every blocking policy.
+
+    Policy start and end times sit in a heap; changing a policy bumps its
+    generation so entries queued for the old version are skipped when they come
+    up. While any policy is active the worker also runs an AppBlocker cycle every
+    `interval` seconds against the union of the active app sets. The active
+    policies, the union and the policy table are republished as immutable
+    snapshots on every change, so readers get them in O(1) without locking.
+
+    With a process event monitor, pids that start or exec while a block is active
+    are checked straight away instead of waiting for the next cycle.
+    """
+
+    def __init__(self, blocker=None, interval=BLOCKER_INTERVAL, clock=time.time, events=None):
+        super().__init__(name="block-scheduler", daemon=True)
+        self.blocker = blocker if blocker is not None else AppBlocker()
+        self.interval = interval
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._heap = []  # (when, seq, generation, name)
+        self._seq = itertools.count()
+        self._policies = {}  # name -> BlockPolicy
+        self._generations = {}  # name -> generation of the current version
+        self._active_names = set()
+        self._next_enforce = None
+        self._started_pids = set()
+        self._stopped = False
+        self.reports = deque(maxlen=BLOCKER_REPORT_HISTORY)  # full cycles only
+        self.total_closed = 0
+        self.closed_on_start = 0  # closed by the checks run on process start events
+        self._publish()
+        self.events = events if events is not None else get_process_monitor()
+        if self.events is not None:
+            self.events.subscribe(self._on_events)
+
+    def _on_events(self, events):
+        # Called on the monitor thread; only queue the pids for the worker
+        if not self.blocked_apps:
+            return
+        with self._cond:
+            for kind, pid in events:
+                if kind == 'lost':
+                    # Starts may have been missed; run a full cycle now
+                    self._next_enforce = None
+                    self._cond.notify()
+                elif kind != 'exit':
+                    self._started_pids.add(pid)
+            if self._started_pids:
+                self._cond.notify()
+
+    def _publish(self):
+        active = tuple(self._policies[name] for name in sorted(self._active_names))
+        self.policies = MappingProxyType(dict(self._policies))
+        self.active = active
+        self.blocked_apps = frozenset().union(*(policy.apps for policy in active))
+        self.blocker.set_blocked(self.blocked_apps)
+
+    def _push(self, policy, now):
+        generation = self._generations.get(policy.name, 0) + 1
+        self._generations[policy.name] = generation
+        self._policies[policy.name] = policy
+        if policy.start <= now < policy.end:
+            self._active_names.add(policy.name)
+        else:
+            self._active_names.discard(policy.name)
+        for when in (policy.start, policy.end):
+            heapq.heappush(self._heap, (when, next(self._seq), generation, policy.name))
+
+    def schedule(self, name, apps, start, end, recurrence=None):
+        """
+        Add or update the policy `name`, blocking `apps` from `start` to `end`.
+
+        If `name` already exists and the windows overlap or touch, the two are merged
+        into one window covering both, blocking both app sets; otherwise the new
+        window replaces the old one.
+        """
+        if end <= start:
+            raise ValueError("A blocking policy must end after it starts")
+        if recurrence is not None and recurrence not in RECURRENCES:
+            raise ValueError(f"Unknown recurrence: {recurrence}")
+        policy = BlockPolicy(name, frozenset(apps), start, end, recurrence)
+        with self._cond:
+            existing = self._policies.get(name)
+            if existing is not None and start <= existing.end and existing.start <= end:
+                policy = policy._replace(apps=policy.apps | existing.apps,
+                                         start=min(start, existing.start), end=max(end, existing.end))
+            self._push(policy, self._clock())
+            self._publish()
+            self._cond.notify()
+        return policy
+
+    def extend(self, name, seconds):
+        """Push the end of policy `name` back by `seconds`; returns False if it no longer exists."""
+        with self._cond:
+            policy = self._policies.get(name)
+            if policy is None or policy.end <= self._clock():
+                return False
+            self._push(policy._replace(end=policy.end + seconds), self._clock())
+            self._publish()
+            self._cond.notify()
+        return True
+
+    def cancel(self, name):
+        """Remove policy `name`, lifting its block immediately."""
+        with self._cond:
+            if self._policies.pop(name, None) is None:
+                return
+            self._generations[name] += 1
+            self._active_names.discard(name)
+            self._publish()
+            self._cond.notify()
+
+    def _advance(self, now):
+        """Apply every heap entry due by `now`."""
+        while self._heap and self._heap[0][0] <= now:
+            _, _, generation, name = heapq.heappop(self._heap)
+            if self._generations.get(name) != generation:
+                continue  # queued for a version that has since changed
+            policy = self._policies[name]
+            if policy.start <= now < policy.end:
+                self._active_names.add(name)
+            elif now >= policy.end:
+                self._active_names.discard(name)
+                if policy.recurrence is not None:
+                    following = next_occurrence(policy)
+                    while following.end <= now:
+                        following = next_occurrence(following)
+                    self._push(following, now)
+                else:
+                    del self._policies[name]
+                    self._generations[name] += 1
+
+    def run(self):
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                now = self._clock()
+                self._advance(now)
+                self._publish()
+                enforce = bool(self._active_names) and (self._next_enforce is None or now >= self._next_enforce)
+                if not self._active_names:
+                    self._next_enforce = None
+                    self._started_pids.clear()
+                elif enforce:
+                    self._next_enforce = now + self.interval
+                # A full cycle covers the new pids as well
+                started, self._started_pids = (None if enforce else self._started_pids), set()
+
+                wake = [self._heap[0][0]] if self._heap else []
+                if self._next_enforce is not None:
+                    wake.append(self._next_enforce)
+                if not enforce and not started:
+                    # Wake for the next event, a change through the public methods, or at least once a minute
+                    timeout = min(wake) - now if wake else 60.0
+                    self._cond.wait(max(0.0, min(timeout, 60.0)))
+                    continue
+
+            try:
+                report = self.blocker.enforce(started)
+            except Exception as e:
+                print(f"Blocker cycle failed: {e}")
+            else:
+                closed = len(report.terminated) + len(report.killed)
+                self.total_closed += closed
+                if started is None:
+                    self.reports.append(report)
+                else:
+                    self.closed_on_start += closed
+
+    def stop(self):
+        """Stop the worker; active blocks are lifted."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
@@ -0,0 +1,263 @@
+# proc_events.py
+
+import errno
+import os
+import select
+import socket
+import struct
+import sys
+import threading
+import time
+from collections import namedtuple
+
+from constants import PROCESS_EVENTS, PROC_DIFF_INTERVAL
+
+# kind is 'start' (new process), 'exec' (process replaced its image) or 'exit';
+# 'lost' (pid None) means events were dropped and subscribers should resync
+ProcessEvent = namedtuple('ProcessEvent', ['kind', 'pid'])
+
+# Linux proc connector protocol (linux/connector.h, linux/cn_proc.h)
+NETLINK_CONNECTOR = 11
+CN_IDX_PROC = 1
+CN_VAL_PROC = 1
+NLMSG_DONE = 3
+PROC_CN_MCAST_LISTEN = 1
+PROC_EVENT_NONE = 0x00000000  # the kernel's acknowledgement of a listen request
+PROC_EVENT_FORK = 0x00000001
+PROC_EVENT_EXEC = 0x00000002
+PROC_EVENT_EXIT = 0x80000000
+
+NLMSGHDR = struct.Struct('=IHHII')  # len, type, flags, seq, pid
+CN_MSG = struct.Struct('=IIIIHH')  # idx, val, seq, ack, len, flags
+PROC_EVENT_HEADER = struct.Struct('=IIQ')  # what, cpu, timestamp_ns
+FORK_EVENT = struct.Struct('=IIII')  # parent pid/tgid, child pid/tgid
+EXEC_EVENT = struct.Struct('=II')  # pid, tgid
+EXIT_EVENT = struct.Struct('=II')  # pid, tgid (exit code and signal follow)
+ACK_EVENT = struct.Struct('=I')  # errno, 0 on success
+
+class ProcConnectorSource:
+    """
+    Process lifecycle events pushed by the kernel through the netlink proc connector.
+
+    Needs Linux and, on most kernels, CAP_NET_ADMIN. Only whole processes are
+    reported; thread forks and exits are dropped.
+    """
+
+    name = 'connector'
+
+    # How long to wait for the kernel to acknowledge the subscription
+    ACK_TIMEOUT = 1.0
+
+    def __init__(self):
+        self._sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_CONNECTOR)
+        try:
+            self._sock.bind((0, CN_IDX_PROC))
+            listen = CN_MSG.pack(CN_IDX_PROC, CN_VAL_PROC, 0, 0, 4, 0) + struct.pack('=I', PROC_CN_MCAST_LISTEN)
+            self._sock.send(NLMSGHDR.pack(NLMSGHDR.size + len(listen), NLMSG_DONE, 0, 0, os.getpid()) + listen)
+            self._await_ack()
+        except OSError:
+            self._sock.close()
+            raise
+
+    def _await_ack(self):
+        """
+        Wait for the kernel to accept the listen request, raising OSError if it does not.
+
+        A missing CAP_NET_ADMIN is reported as an EPERM ack rather than a failed
+        send, and requests from outside the initial user and pid namespaces (e.g. in
+        containers) are ignored without any reply.
+        """
+        deadline = time.monotonic() + self.ACK_TIMEOUT
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([self._sock], [], [], remaining)[0]:
+                raise OSError(errno.ETIMEDOUT, "The proc connector did not acknowledge the subscription")
+            data = self._sock.recv(65536)
+            for offset in self._messages(data):
+                err = self._parse_ack(data, offset + CN_MSG.size)
+                if err is None:
+                    continue  # an event that arrived first
+                if err:
+                    raise OSError(err, os.strerror(err))
+                return
+
+    @staticmethod
+    def _messages(data):
+        """Offsets of the cn_msg headers of every netlink message in one datagram."""
+        offset = 0
+        while offset + NLMSGHDR.size <= len(data):
+            length = NLMSGHDR.unpack_from(data, offset)[0]
+            if length < NLMSGHDR.size:
+                break
+            yield offset + NLMSGHDR.size
+            offset += (length + 3) & ~3
+
+    def read(self, timeout):
+        """Events received within `timeout` seconds."""
+        ready, _, _ = select.select([self._sock], [], [], timeout)
+        if not ready:
+            return []
+        data = self._sock.recv(65536)
+        events = []
+        for offset in self._messages(data):
+            event = self._parse(data, offset + CN_MSG.size)
+            if event is not None:
+                events.append(event)
+        return events
+
+    @staticmethod
+    def _parse_ack(data, offset):
+        """The errno carried by the ack at `offset`, or None if the message is an event."""
+        if offset + PROC_EVENT_HEADER.size + ACK_EVENT.size > len(data):
+            return None
+        if PROC_EVENT_HEADER.unpack_from(data, offset)[0] != PROC_EVENT_NONE:
+            return None
+        return ACK_EVENT.unpack_from(data, offset + PROC_EVENT_HEADER.size)[0]
+
+    @staticmethod
+    def _parse(data, offset):
+        if offset + PROC_EVENT_HEADER.size > len(data):
+            return None
+        what = PROC_EVENT_HEADER.unpack_from(data, offset)[0]
+        offset += PROC_EVENT_HEADER.size
+        if what == PROC_EVENT_FORK:
+            _, _, child_pid, child_tgid = FORK_EVENT.unpack_from(data, offset)
+            return ProcessEvent('start', child_tgid) if child_pid == child_tgid else None
+        if what == PROC_EVENT_EXEC:
+            return ProcessEvent('exec', EXEC_EVENT.unpack_from(data, offset)[1])
+        if what == PROC_EVENT_EXIT:
+            pid, tgid = EXIT_EVENT.unpack_from(data, offset)
+            return ProcessEvent('exit', tgid) if pid == tgid else None
+        return None
+
+    def close(self):
+        self._sock.close()
+
+class ProcDiffSource:
+    """
+    Fallback that diffs the pid list of /proc every `interval` seconds.
+
+    Only directory names are read, no per-process files. Every new pid is reported
+    again as an 'exec' on the following poll, so a fork that had not exec'd yet
+    when it was first seen still gets its real name looked up.
+    """
+
+    name = 'procdiff'
+
+    def __init__(self, root='/proc', interval=PROC_DIFF_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self._pids = self._list()
+        self._recent = set()
+
+    def _list(self):
+        with os.scandir(self.root) as entries:
+            return {int(entry.name) for entry in entries if entry.name.isdigit()}
+
+    def read(self, timeout):
+        time.sleep(min(self.interval, timeout))
+        pids = self._list()
+        started = pids - self._pids
+        exited = self._pids - pids
+        events = [ProcessEvent('exec', pid) for pid in self._recent & pids]
+        events += [ProcessEvent('start', pid) for pid in started]
+        events += [ProcessEvent('exit', pid) for pid in exited]
+        self._pids = pids
+        self._recent = started
+        return events
+
+    def close(self):
+        pass
+
+PROCESS_EVENT_SOURCES = {
+    'connector': ProcConnectorSource,
+    'procdiff': ProcDiffSource,
+}
+
+def get_process_event_source(name=PROCESS_EVENTS):
+    """
+    Create a process event source by name, or None when events are off or unsupported.
+
+    'auto' uses the proc connector where permitted and falls back to /proc diffing;
+    on other platforms it returns None and callers keep polling.
+    """
+    if name == 'off':
+        return None
+    if name == 'auto':
+        if not (sys.platform.startswith('linux') and os.path.isdir('/proc')):
+            return None
+        try:
+            return ProcConnectorSource()
+        except OSError:
+            return ProcDiffSource()
+    try:
+        return PROCESS_EVENT_SOURCES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown process event source: {name}")
+
+class ProcessEventMonitor(threading.Thread):
+    """
+    Background thread that reads one process event source and fans the events out.
+
+    Subscribers are called from this thread with each non-empty batch of
+    ProcessEvents and must return quickly, e.g. by queueing work for their own thread.
+    When a read fails, e.g. because the kernel dropped events, they get a batch
+    holding a single 'lost' event instead.
+    """
+
+    # Longest a read may block, which bounds how long stop() takes
+    POLL_TIMEOUT = 0.5
+
+    def __init__(self, source):
+        super().__init__(name="process-events", daemon=True)
+        self.source = source
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    def subscribe(self, callback):
+        with self._lock:
+            self._subscribers = self._subscribers + [callback]
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._subscribers = [cb for cb in self._subscribers if cb is not callback]
+
+    def run(self):
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    events = self.source.read(self.POLL_TIMEOUT)
+                except OSError as e:
+                    # e.g. ENOBUFS when the kernel dropped events
+                    print(f"Process event read failed: {e}")
+                    events = [ProcessEvent('lost', None)]
+                if events:
+                    self._dispatch(events)
+        finally:
+            self.source.close()
+
+    def _dispatch(self, events):
+        for callback in self._subscribers:
+            try:
+                callback(events)
+            except Exception as e:
+                print(f"Process event subscriber failed: {e}")
+
+    def stop(self):
+        self._stop_event.set()
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+def get_process_monitor():
+    """Return the process-wide event monitor, starting it on first use; None if events are unavailable."""
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            source = get_process_event_source()
+            if source is None:
+                return None
+            _monitor = ProcessEventMonitor(source)
+            _monitor.start()
+        return _monitor
@@ -0,0 +1,108 @@
+# process_sources.py
+
+import os
+import sys
+
+import psutil
+
+class PsutilProcessSource:
+    """Process table backed by psutil; works on every platform."""
+
+    name = 'psutil'
+
+    def pids(self):
+        return psutil.pids()
+
+    def describe(self, pid):
+        """Return (create_time, name, ppid) for a pid."""
+        proc = psutil.Process(pid)
+        with proc.oneshot():
+            return proc.create_time(), proc.name(), proc.ppid()
+
+class ProcfsProcessSource:
+    """
+    Linux process table read straight from /proc.
+
+    Skips psutil's per-Process object construction: pids come from a single
+    os.scandir over /proc and names from /proc/<pid>/comm, with the start time
+    and parent pid taken from /proc/<pid>/stat.
+    """
+
+    name = 'procfs'
+
+    def __init__(self, root='/proc'):
+        self.root = root
+        self._clock_ticks = os.sysconf('SC_CLK_TCK')
+        self._boot_time = self._read_boot_time()
+
+    def _read_boot_time(self):
+        with open(os.path.join(self.root, 'stat'), 'rb') as f:
+            for line in f:
+                if line.startswith(b'btime'):
+                    return float(line.split()[1])
+        return 0.0
+
+    def pids(self):
+        with os.scandir(self.root) as entries:
+            return [int(entry.name) for entry in entries if entry.name.isdigit()]
+
+    def _read(self, pid, filename):
+        try:
+            with open(f"{self.root}/{pid}/{filename}", 'rb') as f:
+                return f.read()
+        except (FileNotFoundError, ProcessLookupError):
+            raise psutil.NoSuchProcess(pid)
+        except PermissionError:
+            raise psutil.AccessDenied(pid)
+
+    def describe(self, pid):
+        """Return (create_time, name, ppid) for a pid."""
+        name = self._read(pid, 'comm').rstrip(b'\n').decode(errors='replace')
+        if len(name) >= 15:
+            # comm is truncated to 15 characters; recover the full name from cmdline
+            cmdline = self._read(pid, 'cmdline').split(b'\0', 1)[0]
+            full_name = os.path.basename(cmdline.decode(errors='replace'))
+            if full_name.startswith(name):
+                name = full_name
+
+        stat = self._read(pid, 'stat')
+        # The command name may contain spaces or parentheses, so split after the last ')'
+        fields = stat[stat.rindex(b')') + 2:].split()
+        ppid = int(fields[1])
+        start_ticks = int(fields[19])
+        return self._boot_time + start_ticks / self._clock_ticks, name, ppid
+
+class StaticProcessSource:
+    """
+    In-memory process table for tests.
+
+    `table` maps pid -> (create_time, name, ppid); mutate it to simulate churn.
+    """
+
+    name = 'static'
+
+    def __init__(self, table=None):
+        self.table = dict(table or {})
+
+    def pids(self):
+        return list(self.table)
+
+    def describe(self, pid):
+        try:
+            return self.table[pid]
+        except KeyError:
+            raise psutil.NoSuchProcess(pid)
+
+PROCESS_SOURCES = {
+    'psutil': PsutilProcessSource,
+    'procfs': ProcfsProcessSource,
+}
+
+def get_process_source(name='auto'):
+    """Create a process source by name; 'auto' prefers /proc on Linux."""
+    if name == 'auto':
+        name = 'procfs' if sys.platform.startswith('linux') and os.path.isdir('/proc') else 'psutil'
+    try:
+        return PROCESS_SOURCES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown process source: {name}")
@@ -0,0 +1,129 @@
+# ringbuffer.py
+
+import mmap
+import os
+
+import numpy as np
+
+from constants import RING_BUFFER_PATH, RING_BUFFER_CAPACITY
+
+MAGIC = b'STRB'
+VERSION = 1
+
+# Records checked per step when walking back from the newest record
+LATEST_CHUNK = 4096
+
+# Sample flags
+FLAG_STARTED = 1  # first tick of a new usage interval
+FLAG_LATE = 2  # the tick fired late and its credit may have been capped
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S4'),
+    ('version', '<u4'),
+    ('capacity', '<u8'),
+    ('write_seq', '<u8'),  # total records ever written; the writer bumps it after each batch
+    ('reserved', '<u8'),
+])
+SAMPLE_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('app_id', '<u2'),
+    ('flags', '<u2'),
+    ('reserved', '<u4'),
+])
+
+class SampleRing:
+    """
+    Fixed-size ring buffer of sample records in a memory-mapped file.
+
+    One writer (the sampler) appends (timestamp, app_id, flags) records; any number
+    of readers, in this or other processes, map the same file and look at the
+    records through NumPy views without copying or locking. The writer publishes a
+    batch by bumping `write_seq` in the header only after the records are in place.
+    Readers should aggregate what they read promptly: records older than
+    `write_seq - capacity` are overwritten as the writer wraps around.
+    """
+
+    def __init__(self, path=RING_BUFFER_PATH, capacity=RING_BUFFER_CAPACITY, writable=False):
+        self.path = path
+        self.writable = writable
+        size = HEADER_DTYPE.itemsize + capacity * SAMPLE_DTYPE.itemsize
+
+        if writable:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fresh = os.fstat(fd).st_size != size
+                if fresh:
+                    os.ftruncate(fd, size)
+                self._mmap = mmap.mmap(fd, size)
+            finally:
+                os.close(fd)
+        else:
+            with open(path, 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._header = np.frombuffer(self._mmap, dtype=HEADER_DTYPE, count=1)
+        if writable and (fresh or self._header['magic'][0] != MAGIC):
+            self._header['magic'] = MAGIC
+            self._header['version'] = VERSION
+            self._header['capacity'] = capacity
+            self._header['write_seq'] = 0
+        if self._header['magic'][0] != MAGIC or self._header['version'][0] != VERSION:
+            raise ValueError(f"{path} is not a sample ring buffer")
+
+        self.capacity = int(self._header['capacity'][0])
+        self._records = np.frombuffer(self._mmap, dtype=SAMPLE_DTYPE, count=self.capacity,
+                                      offset=HEADER_DTYPE.itemsize)
+
+    @property
+    def write_seq(self):
+        return int(self._header['write_seq'][0])
+
+    def append(self, timestamp, app_ids, flags):
+        """Append one record per app id, all stamped with `timestamp`."""
+        count = len(app_ids)
+        if count == 0:
+            return
+        seq = self.write_seq
+        slots = (seq + np.arange(count)) % self.capacity
+        self._records['timestamp'][slots] = timestamp
+        self._records['app_id'][slots] = app_ids
+        self._records['flags'][slots] = flags
+        # Publish only once the records are written
+        self._header['write_seq'] = seq + count
+
+    def _window(self, first_seq, count):
+        """The `count` records from sequence number `first_seq` on; a view unless they wrap around."""
+        start = first_seq % self.capacity
+        if start + count <= self.capacity:
+            return self._records[start:start + count]
+        return np.concatenate((self._records[start:], self._records[:start + count - self.capacity]))
+
+    def latest(self, seconds, now):
+        """
+        Records from the last `seconds` before `now`, oldest first.
+
+        The window is the run of newest records stamped at or after `now - seconds`,
+        found by walking back from the write position in chunks. Timestamps are wall
+        clock time and may step backwards (NTP, manual changes), so the walk stops at
+        the first record that is too old rather than relying on sorted timestamps.
+        The result is a zero-copy view unless the window wraps around the end of
+        the buffer.
+        """
+        seq = self.write_seq
+        available = min(seq, self.capacity)
+        cutoff = now - seconds
+        count = 0
+        while count < available:
+            chunk = min(LATEST_CHUNK, available - count)
+            stamps = self._window(seq - count - chunk, chunk)['timestamp']
+            older = np.flatnonzero(stamps < cutoff)
+            if len(older):
+                count += chunk - 1 - int(older[-1])
+                break
+            count += chunk
+        return self._window(seq - count, count)
+
+    def close(self):
+        self._records = None
+        self._header = None
+        self._mmap.close()
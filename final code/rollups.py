@@ -0,0 +1,66 @@
+# rollups.py
+
+from datetime import datetime, timedelta
+
+# Coarsest first; buckets are aligned to local time
+LEVELS = ('day', 'hour', 'minute')
+
+# Nominal bucket length plus slack that absorbs DST shifts when finding the next bucket
+_SPANS = {
+    'minute': (60, 0),
+    'hour': (3600, 0),
+    'day': (86400, 3 * 3600),
+    'week': (7 * 86400, 3 * 3600),  # Monday-based; used by the goal ledger, not rolled up
+}
+
+def bucket_start(level, ts):
+    """Start of the `level` bucket containing timestamp `ts`."""
+    if level == 'minute':
+        return ts - ts % 60
+    moment = datetime.fromtimestamp(ts)
+    if level == 'hour':
+        return moment.replace(minute=0, second=0, microsecond=0).timestamp()
+    midnight = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if level == 'week':
+        midnight -= timedelta(days=midnight.weekday())
+    return midnight.timestamp()
+
+def next_bucket(level, bucket):
+    """Start of the bucket after the one starting at `bucket`."""
+    span, slack = _SPANS[level]
+    if level == 'minute':
+        return bucket + span
+    return bucket_start(level, bucket + span + slack)
+
+def split_by_bucket(level, start, end):
+    """Yield (bucket, seconds) for the part of [start, end) falling in each bucket."""
+    bucket = bucket_start(level, start)
+    while bucket < end:
+        following = next_bucket(level, bucket)
+        seconds = min(end, following) - max(start, bucket)
+        if seconds > 0:
+            yield bucket, seconds
+        bucket = following
+
+def plan_range(start, end, levels=LEVELS):
+    """
+    Cover [start, end) with the coarsest whole buckets possible.
+
+    Returns (level, lo, hi) pieces; level None marks sub-minute edges that have to
+    be answered from the raw intervals.
+    """
+    if start >= end:
+        return []
+    if not levels:
+        return [(None, start, end)]
+
+    level = levels[0]
+    first = bucket_start(level, start)
+    if first < start:
+        first = next_bucket(level, first)
+    last = bucket_start(level, end)
+    if first >= last:
+        return plan_range(start, end, levels[1:])
+    return (plan_range(start, first, levels[1:]) +
+            [(level, first, last)] +
+            plan_range(last, end, levels[1:]))
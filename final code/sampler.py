@@ -0,0 +1,160 @@
+# sampler.py
+
+import threading
+import time
+from collections import defaultdict, namedtuple
+from datetime import datetime
+from types import MappingProxyType
+
+from constants import (NOTIFICATION_THRESHOLD, EVENING_HOUR_START, EVENING_HOUR_END, PROCESS_SOURCE,
+                       IDLE_SOURCE, BLUE_LIGHT_THRESHOLD)
+from process_sources import get_process_source
+from proc_events import get_process_monitor
+from idle import get_idle_source, ScreenStreakDetector
+from scanner import ProcessScanner
+from scheduler import TickScheduler
+from intervals import IntervalEncoder
+from app_index import APP_INDEX
+from ringbuffer import FLAG_STARTED, FLAG_LATE
+from tracker import (sample_running_apps, send_notification, send_blue_light_notification,
+                     send_eye_break_notification)
+from utils import get_display_name
+
+# Immutable view of the sampler state handed to the UI; continuous_seconds is None
+# when the idle source cannot tell breaks from screen use
+UsageSnapshot = namedtuple('UsageSnapshot', ['screen_time', 'process_counts', 'ticks', 'started_at',
+                                             'updated_at', 'missed_ticks', 'late_ticks',
+                                             'continuous_seconds', 'streak_started_at'])
+
+class ScreenTimeSampler(threading.Thread):
+    """Background thread that keeps sampling running apps for as long as the app is up."""
+
+    # Never credit more than this many intervals for one tick, e.g. after a suspend
+    MAX_CREDIT_INTERVALS = 5
+
+    def __init__(self, interval=1.0, source=None, store=None, ring=None, idle_source=None):
+        super().__init__(name="screen-time-sampler", daemon=True)
+        self.interval = interval
+        self.store = store
+        self.ring = ring
+        self.encoder = IntervalEncoder()
+        self.scheduler = TickScheduler(interval)
+        if source is None:
+            # The live process table can be kept current from process events instead of rescans
+            self.scanner = ProcessScanner(get_process_source(PROCESS_SOURCE), events=get_process_monitor())
+        else:
+            self.scanner = ProcessScanner(source)
+        self.idle_source = idle_source if idle_source is not None else get_idle_source(IDLE_SOURCE)
+        self.streak = ScreenStreakDetector()
+        self._eye_break_sent_for = None  # streak start the last eye break reminder was sent for
+        self._usage_alerted = set()  # apps already alerted for crossing the usage threshold
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._screen_time = defaultdict(float)
+        self._process_counts = {}
+        self._ticks = 0
+        self._started_at = time.time()
+        self._continuous_seconds = None  # no streak measured yet
+        self._publish(updated_at=None)
+
+    def run(self):
+        self.scheduler.start()
+        while True:
+            elapsed = self.scheduler.wait(self._stop_event)
+            if elapsed is None:
+                break
+            try:
+                self.tick(elapsed)
+            except Exception as e:
+                print(f"Sampler tick failed: {e}")
+        if self.store is not None:
+            self.store.record(self.encoder.close_all())
+            self.store.flush()
+
+    def _publish(self, updated_at):
+        # Publish a new immutable snapshot; readers only ever swap references
+        self._snapshot = UsageSnapshot(
+            MappingProxyType(dict(self._screen_time)),
+            MappingProxyType(self._process_counts),
+            self._ticks,
+            self._started_at,
+            updated_at,
+            self.scheduler.missed_ticks,
+            self.scheduler.late_ticks,
+            self._continuous_seconds,
+            self.streak.started_at
+        )
+
+    def tick(self, elapsed=None):
+        """Take one sample, credit the elapsed seconds and publish a fresh snapshot."""
+        if elapsed is None:
+            elapsed = self.interval
+        credit = min(elapsed, self.interval * self.MAX_CREDIT_INTERVALS)
+        counts = sample_running_apps(self.scanner)
+        started = [name not in self._process_counts for name in counts]
+        idle = self.idle_source.idle_seconds()
+
+        with self._lock:
+            # Each running app is credited once, however many processes it has
+            for name in counts:
+                self._screen_time[name] += credit
+            self._process_counts = dict(counts)
+            self._ticks += 1
+            now = time.time()
+            # Without idle time a streak would never end, so it is reported as unknown
+            self._continuous_seconds = self.streak.update(now, idle) if idle is not None else None
+            self._publish(updated_at=now)
+            usage = self._snapshot.screen_time
+
+        # Only state changes produce new intervals
+        closed = self.encoder.update(now, counts, credit)
+        if self.store is not None:
+            self.store.record(closed, self.encoder.open_intervals())
+        if self.ring is not None:
+            late = FLAG_LATE if elapsed - self.interval > self.scheduler.tolerance else 0
+            self.ring.append(
+                now,
+                [APP_INDEX.lookup(name).app_id for name in counts],
+                [(FLAG_STARTED if is_new else 0) | late for is_new in started]
+            )
+
+        # Alert once per app when its usage first crosses the threshold
+        for name in counts:
+            if usage[name] >= NOTIFICATION_THRESHOLD * 60 and name not in self._usage_alerted:
+                self._usage_alerted.add(name)
+                send_notification(get_display_name(name), usage[name])
+
+        # Remind once per streak when continuous screen use passes the threshold
+        if (self._continuous_seconds is not None and self._continuous_seconds >= BLUE_LIGHT_THRESHOLD * 60 and
+                self._eye_break_sent_for != self.streak.started_at):
+            self._eye_break_sent_for = self.streak.started_at
+            send_eye_break_notification(self._continuous_seconds / 60)
+
+        # Check for blue light filter suggestion
+        current_hour = datetime.now().hour
+        if EVENING_HOUR_START <= current_hour < EVENING_HOUR_END:
+            send_blue_light_notification()
+
+    def snapshot(self):
+        """Return the latest published usage snapshot without waiting on the sampler."""
+        return self._snapshot
+
+    def reset(self):
+        """Forget everything recorded so far; intervals still open are closed and stored first."""
+        with self._lock:
+            self._screen_time.clear()
+            self._usage_alerted.clear()
+            self._process_counts = {}
+            self._ticks = 0
+            self._started_at = time.time()
+            self._continuous_seconds = None
+            self.streak = ScreenStreakDetector()
+            closed = self.encoder.close_all()
+            self._publish(updated_at=None)
+        if self.store is not None:
+            self.store.record(closed)
+            self.store.flush()
+
+    def stop(self):
+        """Ask the sampler to exit after the current tick."""
+        self._stop_event.set()
@@ -0,0 +1,131 @@
+# scanner.py
+
+import threading
+import time
+
+import psutil
+
+from constants import PROCESS_RESYNC_INTERVAL, PROCESS_EVENT_BACKLOG
+from process_sources import get_process_source
+
+class ProcessScanner:
+    """
+    Incremental process table scanner.
+
+    Keeps a pid -> (create_time, name, ppid) cache so each scan only resolves names for
+    pids it has not seen before and evicts pids that have exited. Every
+    `resync_interval` seconds a scan also re-describes the cached pids, replacing
+    any whose create time changed because the pid was reused by another process.
+
+    With a ProcessEventMonitor attached, scans in between only apply the pids
+    reported as started, exec'd or exited since the previous scan; a report of lost
+    events brings the resync forward to the next scan. A scanner that is not
+    scanned for a while, e.g. the blocker's outside a block, stops recording after
+    `max_pending` changes and resyncs on its next scan instead.
+    """
+
+    def __init__(self, source=None, events=None, resync_interval=PROCESS_RESYNC_INTERVAL, clock=time.monotonic,
+                 max_pending=PROCESS_EVENT_BACKLOG):
+        self.source = source if source is not None else get_process_source()
+        self._cache = {}
+        self.resolved = 0  # pids resolved during the last scan
+        self.evicted = 0  # pids evicted during the last scan
+        self.replaced = 0  # reused pids found during the last resync
+        self.events = events
+        self.resync_interval = resync_interval
+        self._clock = clock
+        self.max_pending = max_pending
+        self._last_full_scan = None
+        self._changed = {}  # pid -> latest event kind, filled from the monitor thread
+        self._resync = False  # set when the pending changes were dropped
+        self._changed_lock = threading.Lock()
+        if events is not None:
+            events.subscribe(self._on_events)
+
+    def _on_events(self, events):
+        with self._changed_lock:
+            if self._resync:
+                return
+            lost = False
+            for kind, pid in events:
+                if kind == 'lost':
+                    lost = True
+                else:
+                    self._changed[pid] = kind
+            if lost or len(self._changed) > self.max_pending:
+                # The next scan walks the whole table anyway
+                self._changed.clear()
+                self._resync = True
+
+    def _describe(self, pid):
+        try:
+            self._cache[pid] = self.source.describe(pid)
+        except psutil.NoSuchProcess:
+            self._cache.pop(pid, None)
+        except psutil.AccessDenied:
+            # Remember the failure so we do not retry it every tick
+            self._cache[pid] = (None, None, None)
+
+    def scan(self):
+        """Refresh the cache and return it as a pid -> (create_time, name, ppid) dict."""
+        with self._changed_lock:
+            changed, self._changed = self._changed, {}
+            resync, self._resync = self._resync, False
+        now = self._clock()
+        resync = resync or self._last_full_scan is None or now - self._last_full_scan >= self.resync_interval
+        if self.events is not None and not resync:
+            return self._apply(changed)
+
+        cache = self._cache
+        pids = set(self.source.pids())
+
+        exited = cache.keys() - pids
+        for pid in exited:
+            del cache[pid]
+
+        new_pids = pids - cache.keys()
+        for pid in new_pids:
+            self._describe(pid)
+
+        self.resolved = len(new_pids)
+        self.evicted = len(exited)
+        self.replaced = 0
+        if resync:
+            self._last_full_scan = now
+            self._verify(pids - new_pids)
+        return cache
+
+    def _verify(self, pids):
+        """Re-describe cached pids, replacing entries that now belong to a different process."""
+        for pid in pids:
+            create_time = self._cache[pid][0]
+            self._describe(pid)
+            entry = self._cache.get(pid)
+            if entry is not None and entry[0] != create_time:
+                self.replaced += 1
+
+    def _apply(self, changed):
+        """Update the cache from process events only."""
+        self.resolved = self.evicted = 0
+        for pid, kind in changed.items():
+            if kind == 'exit':
+                if self._cache.pop(pid, None) is not None:
+                    self.evicted += 1
+            else:
+                # A new process, or one that exec'd and may have a new name
+                self._describe(pid)
+                self.resolved += 1
+        return self._cache
+
+    def names(self):
+        """Scan and yield the name of every running process."""
+        for _, name, _ in self.scan().values():
+            if name is not None:
+                yield name
+
+    def processes(self):
+        """Scan and return a pid -> (name, ppid) dict of every readable process."""
+        return {pid: (name, ppid) for pid, (_, name, ppid) in self.scan().items() if name is not None}
+
+    def clear(self):
+        self._cache.clear()
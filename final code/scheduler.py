@@ -0,0 +1,66 @@
+# scheduler.py
+
+import time
+
+class TickScheduler:
+    """
+    Fixed-deadline tick scheduler on the monotonic clock.
+
+    Deadlines are start + n * interval, so time spent scanning between ticks does
+    not stretch the period. wait() returns the seconds actually elapsed since the
+    previous tick so callers can credit real time instead of assuming one interval.
+    Deadlines that were skipped entirely are counted in missed_ticks, and ticks that
+    fired more than `tolerance` seconds after their deadline in late_ticks.
+    """
+
+    def __init__(self, interval=1.0, tolerance=0.1, clock=time.monotonic, sleep=time.sleep):
+        self.interval = interval
+        self.tolerance = tolerance
+        self._clock = clock
+        self._sleep = sleep
+        self._next_deadline = None
+        self._last_tick = None
+        self.ticks = 0
+        self.missed_ticks = 0
+        self.late_ticks = 0
+        self.max_lateness = 0.0
+
+    def start(self):
+        """Anchor the schedule at the current time."""
+        now = self._clock()
+        self._last_tick = now
+        self._next_deadline = now + self.interval
+
+    def wait(self, stop_event=None):
+        """
+        Block until the next deadline and return the elapsed seconds since the last tick.
+
+        Returns None if `stop_event` was set while waiting.
+        """
+        if self._next_deadline is None:
+            self.start()
+
+        delay = self._next_deadline - self._clock()
+        if delay > 0:
+            if stop_event is not None:
+                if stop_event.wait(delay):
+                    return None
+            else:
+                self._sleep(delay)
+
+        now = self._clock()
+        lateness = now - self._next_deadline
+        if lateness > self.interval:
+            # Skip the deadlines we slept through instead of firing them back to back
+            missed = int(lateness // self.interval)
+            self.missed_ticks += missed
+            self._next_deadline += missed * self.interval
+        if lateness > self.tolerance:
+            self.late_ticks += 1
+        self.max_lateness = max(self.max_lateness, lateness)
+
+        self._next_deadline += self.interval
+        elapsed = now - self._last_tick
+        self._last_tick = now
+        self.ticks += 1
+        return elapsed
@@ -0,0 +1,275 @@
+# store.py
+
+import csv
+import io
+import sqlite3
+import threading
+import time
+import uuid
+
+from constants import USAGE_DB_PATH, STORE_FLUSH_INTERVAL
+from intervals import UsageInterval
+from rollups import LEVELS, split_by_bucket, plan_range
+from utils import categorize_app
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS apps (
+    app_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS usage_intervals (
+    app_id INTEGER NOT NULL REFERENCES apps (app_id),
+    start REAL NOT NULL,
+    end REAL NOT NULL,
+    UNIQUE (app_id, start)
+);
+CREATE INDEX IF NOT EXISTS idx_usage_intervals_end ON usage_intervals (end);
+CREATE TABLE IF NOT EXISTS app_rollups (
+    level TEXT NOT NULL,
+    bucket REAL NOT NULL,
+    app_id INTEGER NOT NULL REFERENCES apps (app_id),
+    seconds REAL NOT NULL,
+    PRIMARY KEY (level, bucket, app_id)
+);
+CREATE TABLE IF NOT EXISTS category_rollups (
+    level TEXT NOT NULL,
+    bucket REAL NOT NULL,
+    category TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (level, bucket, category)
+);
+"""
+
+INSERT_APP = "INSERT OR IGNORE INTO apps (name) VALUES (?)"
+SELECT_APPS = "SELECT name, app_id FROM apps"
+# Open intervals are re-written on every flush, so an interval is keyed by its start
+UPSERT_INTERVAL = """
+INSERT INTO usage_intervals (app_id, start, end) VALUES (?, ?, ?)
+ON CONFLICT (app_id, start) DO UPDATE SET end = excluded.end
+"""
+SELECT_APP_TOTALS = """
+SELECT apps.name, SUM(MIN(i.end, :end) - MAX(i.start, :start))
+FROM usage_intervals AS i JOIN apps USING (app_id)
+WHERE i.end > :start AND i.start < :end
+GROUP BY apps.name
+"""
+ADD_APP_ROLLUP = """
+INSERT INTO app_rollups (level, bucket, app_id, seconds) VALUES (?, ?, ?, ?)
+ON CONFLICT (level, bucket, app_id) DO UPDATE SET seconds = seconds + excluded.seconds
+"""
+ADD_CATEGORY_ROLLUP = """
+INSERT INTO category_rollups (level, bucket, category, seconds) VALUES (?, ?, ?, ?)
+ON CONFLICT (level, bucket, category) DO UPDATE SET seconds = seconds + excluded.seconds
+"""
+SELECT_APP_ROLLUPS = """
+SELECT apps.name, SUM(r.seconds)
+FROM app_rollups AS r JOIN apps USING (app_id)
+WHERE r.level = ? AND r.bucket >= ? AND r.bucket < ?
+GROUP BY apps.name
+"""
+SELECT_CATEGORY_ROLLUPS = """
+SELECT category, SUM(seconds) FROM category_rollups
+WHERE level = ? AND bucket >= ? AND bucket < ?
+GROUP BY category
+"""
+SELECT_INTERVALS = """
+SELECT apps.name, i.start, i.end
+FROM usage_intervals AS i JOIN apps USING (app_id)
+WHERE i.end > :start AND i.start < :end
+ORDER BY i.start, apps.name
+"""
+
+class UsageStore:
+    """
+    Local SQLite store for screen time history.
+
+    Usage is kept as run-length encoded (app_id, start, end) intervals. The sampler
+    hands over closed and still-open intervals every tick; they are buffered in
+    memory and written in one executemany() batch every `flush_interval` seconds,
+    with open intervals upserted in place so a long session stays a single row.
+    The database runs in WAL mode so dashboard sessions can read while the sampler
+    writes. Each thread gets its own connection.
+
+    Per-app and per-category rollups at minute, hour and day granularity are
+    updated in the same transaction from the newly covered part of each interval,
+    and range queries read them from the coarsest level that fits.
+
+    If a GoalLedger is attached, every flushed interval is also handed to it under
+    this store's session id, in the flush transaction. `version` goes up whenever stored data changes.
+    """
+
+    def __init__(self, path=USAGE_DB_PATH, flush_interval=STORE_FLUSH_INTERVAL, ledger=None):
+        if ledger is not None and ledger.path != path:
+            raise ValueError("The goal ledger must live in the usage store's database")
+        self.path = path
+        self.flush_interval = flush_interval
+        self.ledger = ledger
+        self.session_id = uuid.uuid4().hex
+        self._local = threading.local()
+        self._closed = []
+        self._open = []
+        self._app_ids = {}
+        self._flushed_end = {}  # (app, start) -> end already counted in the rollups
+        self._buffer_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self.version = 0
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+            self._app_ids.update(conn.execute(SELECT_APPS).fetchall())
+            has_rollups = conn.execute("SELECT 1 FROM app_rollups LIMIT 1").fetchone()
+            has_intervals = conn.execute("SELECT 1 FROM usage_intervals LIMIT 1").fetchone()
+        if has_intervals and not has_rollups:
+            self.rebuild_rollups()
+        if has_intervals and ledger is not None and ledger.is_empty():
+            # History recorded before the ledger existed is counted once under its own session
+            ledger.ingest('history', self.intervals())
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _app_id(self, conn, name):
+        app_id = self._app_ids.get(name)
+        if app_id is None:
+            conn.execute(INSERT_APP, (name,))
+            app_id = conn.execute("SELECT app_id FROM apps WHERE name = ?", (name,)).fetchone()[0]
+            self._app_ids[name] = app_id
+        return app_id
+
+    def record(self, closed, open_intervals=()):
+        """Buffer intervals from one tick, flushing when the batch is due."""
+        with self._buffer_lock:
+            self._closed.extend(closed)
+            self._open = list(open_intervals)
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """
+        Write buffered intervals in a single transaction.
+
+        If the write fails, the batch goes back into the buffer and nothing is marked
+        as counted, so the next flush retries it.
+        """
+        with self._buffer_lock:
+            closed, self._closed = self._closed, []
+            intervals = closed + self._open
+        self._last_flush = time.monotonic()
+        if not intervals:
+            return 0
+
+        # Only the part of each interval not yet counted goes into the rollups
+        deltas = []
+        flushed_end = {}
+        for app, start, end in intervals:
+            counted = flushed_end.get((app, start), self._flushed_end.get((app, start), start))
+            if end > counted:
+                deltas.append((app, counted, end))
+            flushed_end[(app, start)] = end
+
+        try:
+            with self._connection() as conn:
+                rows = [(self._app_id(conn, app), start, end) for app, start, end in intervals]
+                conn.executemany(UPSERT_INTERVAL, rows)
+                self._add_rollups(conn, deltas)
+                if self.ledger is not None:
+                    # Same transaction, so a crash cannot count an interval in one and not the other
+                    self.ledger.ingest(self.session_id, intervals, conn)
+        except Exception:
+            with self._buffer_lock:
+                self._closed = closed + self._closed
+            # App ids inserted by the rolled back transaction no longer exist
+            self._app_ids.clear()
+            raise
+
+        self._flushed_end.update(flushed_end)
+        for app, start, _ in closed:
+            self._flushed_end.pop((app, start), None)
+        self.version += 1
+        return len(rows)
+
+    def _add_rollups(self, conn, deltas):
+        app_rows = []
+        category_rows = []
+        for app, start, end in deltas:
+            app_id = self._app_id(conn, app)
+            category = categorize_app(app)
+            for level in LEVELS:
+                for bucket, seconds in split_by_bucket(level, start, end):
+                    app_rows.append((level, bucket, app_id, seconds))
+                    category_rows.append((level, bucket, category, seconds))
+        conn.executemany(ADD_APP_ROLLUP, app_rows)
+        conn.executemany(ADD_CATEGORY_ROLLUP, category_rows)
+
+    def rebuild_rollups(self):
+        """Recompute every rollup from the stored intervals."""
+        intervals = self.intervals()
+        with self._connection() as conn:
+            conn.execute("DELETE FROM app_rollups")
+            conn.execute("DELETE FROM category_rollups")
+            self._add_rollups(conn, intervals)
+        self.version += 1
+
+    def _range_totals(self, start, end, rollup_query, raw_totals):
+        totals = {}
+        conn = self._connection()
+        for level, lo, hi in plan_range(start, end):
+            if level is None:
+                rows = raw_totals(lo, hi).items()
+            else:
+                rows = conn.execute(rollup_query, (level, lo, hi)).fetchall()
+            for key, seconds in rows:
+                totals[key] = totals.get(key, 0.0) + seconds
+        return totals
+
+    def _raw_app_totals(self, start, end):
+        rows = self._connection().execute(SELECT_APP_TOTALS, {'start': start, 'end': end}).fetchall()
+        return dict(rows)
+
+    def _raw_category_totals(self, start, end):
+        totals = {}
+        for app, seconds in self._raw_app_totals(start, end).items():
+            category = categorize_app(app)
+            totals[category] = totals.get(category, 0.0) + seconds
+        return totals
+
+    def app_totals(self, start=0.0, end=None):
+        """Return app -> seconds of usage in [start, end), read from the rollups."""
+        end = time.time() if end is None else end
+        return self._range_totals(start, end, SELECT_APP_ROLLUPS, self._raw_app_totals)
+
+    def category_totals(self, start=0.0, end=None):
+        """Return category -> seconds of usage in [start, end), read from the rollups."""
+        end = time.time() if end is None else end
+        return self._range_totals(start, end, SELECT_CATEGORY_ROLLUPS, self._raw_category_totals)
+
+    def intervals(self, start=0.0, end=None):
+        """Return UsageIntervals overlapping [start, end), oldest first."""
+        end = time.time() if end is None else end
+        rows = self._connection().execute(SELECT_INTERVALS, {'start': start, 'end': end})
+        return [UsageInterval(*row) for row in rows]
+
+    def export_csv(self, start=0.0, end=None):
+        """Return the recorded intervals as CSV text."""
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(["application", "start", "end", "seconds"])
+        writer.writerows((app, start, end, end - start) for app, start, end in self.intervals(start, end))
+        return out.getvalue()
+
+    def clear(self):
+        """Delete all recorded history."""
+        with self._buffer_lock:
+            self._closed = []
+            self._open = []
+            self._flushed_end.clear()
+        with self._connection() as conn:
+            conn.execute("DELETE FROM usage_intervals")
+            conn.execute("DELETE FROM app_rollups")
+            conn.execute("DELETE FROM category_rollups")
+        self.version += 1
@@ -0,0 +1,42 @@
+# conftest.py
+
+import os
+import sys
+
+import pytest
+
+# The app modules sit flat in "final code" and import each other by bare name
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class FakeClock:
+    """Stands in for time.time or time.monotonic; set `now` to move time."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+class FakeMonitor:
+    """Stands in for ProcessEventMonitor; call emit() to deliver a batch."""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def subscribe(self, callback):
+        self.callbacks.append(callback)
+
+    def unsubscribe(self, callback):
+        self.callbacks.remove(callback)
+
+    def emit(self, *events):
+        for callback in self.callbacks:
+            callback(list(events))
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def monitor():
+    return FakeMonitor()
@@ -0,0 +1,64 @@
+# test_analysis_cache.py
+
+from analysis_cache import AnalysisCache, usage_fingerprint
+
+class Counter:
+    """Compute function that counts its calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, value):
+        self.calls += 1
+        return value * 2
+
+def test_a_key_is_computed_once():
+    cache = AnalysisCache()
+    compute = Counter()
+
+    assert cache.get_or_compute('a', compute, 1) == 2
+    assert cache.get_or_compute('a', compute, 1) == 2
+    assert compute.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_sync_to_a_new_version_drops_every_entry():
+    cache = AnalysisCache()
+    compute = Counter()
+    cache.sync(1)
+    cache.get_or_compute('a', compute, 1)
+
+    cache.sync(1)
+    cache.get_or_compute('a', compute, 1)
+    assert compute.calls == 1
+
+    cache.sync(2)
+    cache.get_or_compute('a', compute, 1)
+    assert compute.calls == 2
+
+def test_invalidate_drops_every_entry():
+    cache = AnalysisCache()
+    compute = Counter()
+    cache.get_or_compute('a', compute, 1)
+
+    cache.invalidate()
+    cache.get_or_compute('a', compute, 1)
+
+    assert compute.calls == 2
+
+def test_the_least_recently_used_entry_is_evicted():
+    cache = AnalysisCache(max_entries=2)
+    compute = Counter()
+    cache.get_or_compute('a', compute, 1)
+    cache.get_or_compute('b', compute, 2)
+    cache.get_or_compute('a', compute, 1)  # 'b' is now the oldest
+
+    cache.get_or_compute('c', compute, 3)
+    cache.get_or_compute('a', compute, 1)
+    assert compute.calls == 3
+    cache.get_or_compute('b', compute, 2)
+    assert compute.calls == 4
+
+def test_fingerprint_ignores_mapping_order_but_not_content():
+    assert usage_fingerprint({'a': 1, 'b': 2}) == usage_fingerprint({'b': 2, 'a': 1})
+    assert usage_fingerprint({'a': 1}) != usage_fingerprint({'a': 2})
+    assert usage_fingerprint({'a': 1}, {}) != usage_fingerprint({}, {'a': 1})
@@ -0,0 +1,25 @@
+# test_context_switch.py
+
+from context_switch import ContextSwitchAnalyzer
+from intervals import UsageInterval
+
+def test_switches_are_counted_between_categories():
+    analyzer = ContextSwitchAnalyzer().feed([
+        UsageInterval('code.exe', 0, 100),
+        UsageInterval('word.exe', 100, 200),
+        UsageInterval('steam.exe', 200, 300),
+    ])
+    assert analyzer.switches == 1
+    assert analyzer.prod_to_ent_switches == 1
+    assert analyzer.transition_matrix() == {'Productivity': {'Entertainment': 1}}
+
+def test_refetched_open_interval_extends_the_observed_span():
+    analyzer = ContextSwitchAnalyzer().feed([
+        UsageInterval('code.exe', 0, 100),
+        UsageInterval('steam.exe', 100, 200),
+    ])
+    # The next rerun fetches the still-open interval again, now four hours long
+    analyzer.feed([UsageInterval('steam.exe', 100, 4 * 3600)])
+    assert analyzer.switches == 1
+    assert analyzer.last_end == 4 * 3600
+    assert analyzer.switch_rate() == 0.25
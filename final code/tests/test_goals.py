@@ -0,0 +1,66 @@
+# test_goals.py
+
+import pytest
+
+from goals import GoalLedger, week_start
+from utils import categorize_app
+
+APP = 'Code.exe'
+
+@pytest.fixture
+def ledger(tmp_path):
+    return GoalLedger(str(tmp_path / 'goals.db'))
+
+def test_replaying_an_interval_counts_it_once(ledger):
+    week = week_start()
+    interval = (APP, week + 100, week + 160)
+
+    assert ledger.ingest('s1', [interval]) == 60
+    assert ledger.ingest('s1', [interval]) == 0
+    assert ledger.week_totals(week) == {categorize_app(APP): 60}
+
+def test_a_growing_open_interval_only_adds_the_new_part(ledger):
+    week = week_start()
+
+    ledger.ingest('s1', [(APP, week + 100, week + 130)])
+    assert ledger.ingest('s1', [(APP, week + 100, week + 190)]) == 60
+    assert ledger.week_totals(week) == {categorize_app(APP): 90}
+
+def test_the_same_interval_from_another_session_is_counted_again(ledger):
+    week = week_start()
+    interval = (APP, week + 100, week + 160)
+
+    ledger.ingest('s1', [interval])
+    assert ledger.ingest('s2', [interval]) == 60
+
+def test_an_interval_across_the_week_boundary_is_split(ledger):
+    week = week_start()
+    previous = week_start(week - 1)
+
+    ledger.ingest('s1', [(APP, week - 100, week + 40)])
+
+    assert ledger.week_totals(previous) == {categorize_app(APP): 100}
+    assert ledger.week_totals(week) == {categorize_app(APP): 40}
+
+def test_pruned_entries_keep_their_weekly_totals(tmp_path):
+    path = str(tmp_path / 'goals.db')
+    old_week = week_start(week_start() - 14 * 86400)
+    GoalLedger(path).ingest('s1', [(APP, old_week + 10, old_week + 70)])
+
+    # A fresh ledger prunes on its first ingest of the week
+    ledger = GoalLedger(path)
+    ledger.ingest('s2', [])
+    entries = ledger._connection().execute("SELECT COUNT(*) FROM goal_ledger_entries").fetchone()[0]
+
+    assert entries == 0
+    assert not ledger.is_empty()
+    assert ledger.week_totals(old_week) == {categorize_app(APP): 60}
+
+def test_clear_keeps_targets(ledger):
+    ledger.ingest('s1', [(APP, week_start() + 1, week_start() + 2)])
+    ledger.set_target('Work', 10)
+
+    ledger.clear()
+
+    assert ledger.is_empty()
+    assert ledger.targets() == {'Work': 10}
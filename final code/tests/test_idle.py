@@ -0,0 +1,88 @@
+# test_idle.py
+
+import pytest
+
+import notifier
+from idle import NullIdleSource, FakeIdleSource, ScreenStreakDetector, get_idle_source
+from notifier import NotificationDispatcher, NullBackend
+from process_sources import StaticProcessSource
+from sampler import ScreenTimeSampler
+
+def test_null_source_reports_unknown_idle_time():
+    assert NullIdleSource().idle_seconds() is None
+    assert isinstance(get_idle_source('none'), NullIdleSource)
+
+def test_unknown_idle_source():
+    with pytest.raises(ValueError):
+        get_idle_source('nope')
+
+def test_streak_starts_with_the_first_input():
+    streak = ScreenStreakDetector(break_seconds=120)
+    assert streak.update(1000.0, 30.0) == 30.0
+    assert streak.started_at == 970.0
+    assert streak.update(1060.0, 0.0) == 90.0
+
+def test_idle_gap_ends_the_streak():
+    streak = ScreenStreakDetector(break_seconds=120)
+    streak.update(1000.0, 0.0)
+    streak.update(1100.0, 0.0)
+    assert streak.update(1200.0, 120.0) == 0.0
+    assert streak.started_at is None
+    assert streak.breaks == 1
+    # Input again after the break starts a new streak
+    assert streak.update(1210.0, 5.0) == 5.0
+    assert streak.longest == 100.0
+
+def test_gap_between_updates_counts_as_a_break():
+    streak = ScreenStreakDetector(break_seconds=120)
+    streak.update(1000.0, 0.0)
+    # e.g. the machine was suspended; the input idle time does not show it
+    assert streak.update(1500.0, 0.0) == 0.0
+    assert streak.breaks == 1
+    assert streak.started_at == 1500.0
+
+@pytest.fixture
+def quiet_dispatcher(monkeypatch):
+    dispatcher = NotificationDispatcher(backend=NullBackend())
+    monkeypatch.setattr(notifier, '_dispatcher', dispatcher)
+    return dispatcher
+
+def test_sampler_reports_no_streak_without_idle_time(quiet_dispatcher):
+    sampler = ScreenTimeSampler(source=StaticProcessSource({1: (1.0, 'code.exe', 0)}),
+                                idle_source=NullIdleSource())
+    sampler.tick()
+    snapshot = sampler.snapshot()
+    assert snapshot.continuous_seconds is None
+    assert snapshot.streak_started_at is None
+    assert all(kind != 'eye_break' for kind, _ in quiet_dispatcher._pending)
+
+def test_sampler_tracks_the_streak_from_idle_time(quiet_dispatcher):
+    sampler = ScreenTimeSampler(source=StaticProcessSource({1: (1.0, 'code.exe', 0)}),
+                                idle_source=FakeIdleSource(idle=15.0))
+    sampler.tick()
+    assert sampler.snapshot().continuous_seconds == pytest.approx(15.0)
+
+def test_no_streak_before_the_first_tick(quiet_dispatcher):
+    sampler = ScreenTimeSampler(source=StaticProcessSource({}), idle_source=FakeIdleSource())
+    assert sampler.snapshot().continuous_seconds is None
+
+class RecordingStore:
+    def __init__(self):
+        self.recorded = []
+        self.flushes = 0
+
+    def record(self, closed, open_intervals=()):
+        self.recorded.extend(closed)
+
+    def flush(self):
+        self.flushes += 1
+
+def test_reset_stores_the_open_intervals_first(quiet_dispatcher):
+    store = RecordingStore()
+    sampler = ScreenTimeSampler(source=StaticProcessSource({1: (1.0, 'code.exe', 0)}), store=store,
+                                idle_source=FakeIdleSource())
+    sampler.tick()
+    sampler.reset()
+    assert [interval.app.lower() for interval in store.recorded] == ['code.exe']
+    assert store.flushes == 1
+    assert sampler.snapshot().continuous_seconds is None
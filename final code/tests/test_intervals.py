@@ -0,0 +1,46 @@
+# test_intervals.py
+
+from intervals import IntervalEncoder, UsageInterval
+
+def test_consecutive_ticks_extend_one_open_interval():
+    encoder = IntervalEncoder()
+
+    for ts in (101.0, 102.0, 103.0):
+        assert encoder.update(ts, {'Code.exe'}, 1.0) == []
+
+    assert encoder.open_intervals() == [UsageInterval('Code.exe', 100.0, 103.0)]
+
+def test_an_app_missing_from_a_tick_is_closed():
+    encoder = IntervalEncoder()
+    encoder.update(101.0, {'Code.exe', 'chrome.exe'}, 1.0)
+    encoder.update(102.0, {'Code.exe', 'chrome.exe'}, 1.0)
+
+    closed = encoder.update(103.0, {'Code.exe'}, 1.0)
+
+    assert closed == [UsageInterval('chrome.exe', 100.0, 102.0)]
+    assert encoder.open_intervals() == [UsageInterval('Code.exe', 100.0, 103.0)]
+
+def test_a_gap_beyond_the_tolerance_starts_a_new_interval():
+    encoder = IntervalEncoder()
+    encoder.update(101.0, {'Code.exe'}, 1.0)
+
+    # Credit was capped after a stall: the tick only covers its last second
+    closed = encoder.update(110.0, {'Code.exe'}, 1.0)
+
+    assert closed == [UsageInterval('Code.exe', 100.0, 101.0)]
+    assert encoder.open_intervals() == [UsageInterval('Code.exe', 109.0, 110.0)]
+
+def test_jitter_within_the_tolerance_is_bridged():
+    encoder = IntervalEncoder()
+    encoder.update(101.0, {'Code.exe'}, 1.0)
+
+    assert encoder.update(102.4, {'Code.exe'}, 1.0) == []
+    assert encoder.open_intervals() == [UsageInterval('Code.exe', 100.0, 102.4)]
+
+def test_close_all_returns_and_forgets_the_open_intervals():
+    encoder = IntervalEncoder()
+    encoder.update(101.0, {'Code.exe'}, 1.0)
+
+    assert encoder.close_all() == [UsageInterval('Code.exe', 100.0, 101.0)]
+    assert encoder.open_intervals() == []
+    assert encoder.update(102.0, set(), 1.0) == []
@@ -0,0 +1,70 @@
+# test_notifier.py
+
+import time
+
+import pytest
+
+from constants import USAGE_NOTIFICATION_COOLDOWN
+from notifier import NotificationDispatcher, NullBackend, get_notification_backend
+
+def drain(dispatcher, sent, timeout=2.0):
+    """Start the dispatcher and wait until it has delivered `sent` notifications."""
+    if not dispatcher.is_alive():
+        dispatcher.start()
+    deadline = time.monotonic() + timeout
+    while dispatcher.sent < sent and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert dispatcher.sent == sent
+
+@pytest.fixture
+def dispatcher(clock):
+    dispatcher = NotificationDispatcher(backend=NullBackend(), cooldowns={'usage': 10}, clock=clock)
+    yield dispatcher
+    dispatcher.stop()
+
+def test_pending_alerts_for_the_same_key_are_coalesced(dispatcher):
+    assert dispatcher.submit('usage', "Alert", "first", key='chrome.exe')
+    assert dispatcher.submit('usage', "Alert", "second", key='chrome.exe')
+    assert dispatcher.submit('usage', "Alert", "other", key='code.exe')
+    drain(dispatcher, 2)
+    assert [note.message for note in dispatcher.backend.sent] == ["second", "other"]
+    assert dispatcher.coalesced == 1
+
+def test_cooldown_suppresses_repeats_until_it_expires(dispatcher):
+    dispatcher.submit('usage', "Alert", "first", key='chrome.exe')
+    drain(dispatcher, 1)
+    dispatcher._clock.now = 5.0
+    assert not dispatcher.submit('usage', "Alert", "too soon", key='chrome.exe')
+    assert dispatcher.suppressed == 1
+    dispatcher._clock.now = 10.0
+    assert dispatcher.submit('usage', "Alert", "again", key='chrome.exe')
+    drain(dispatcher, 2)
+    assert dispatcher.backend.sent[-1].message == "again"
+
+def test_cooldowns_are_per_kind_and_key(dispatcher):
+    dispatcher.submit('usage', "Alert", "chrome", key='chrome.exe')
+    drain(dispatcher, 1)
+    assert dispatcher.submit('usage', "Alert", "code", key='code.exe')
+    # Kinds without a configured cooldown are never suppressed
+    assert dispatcher.submit('blue_light', "Evening", "filter")
+    drain(dispatcher, 3)
+    assert dispatcher.submit('blue_light', "Evening", "filter")
+
+def test_repeated_usage_alerts_inside_the_default_cooldown_are_dropped(clock):
+    dispatcher = NotificationDispatcher(backend=NullBackend(), clock=clock)
+    try:
+        for minutes in range(3):
+            dispatcher.submit('usage', "Alert", f"{minutes} min", key='chrome.exe')
+        drain(dispatcher, 1)
+        assert dispatcher.coalesced == 2
+        dispatcher._clock.now = USAGE_NOTIFICATION_COOLDOWN - 1
+        assert not dispatcher.submit('usage', "Alert", "still too soon", key='chrome.exe')
+        dispatcher._clock.now = USAGE_NOTIFICATION_COOLDOWN
+        assert dispatcher.submit('usage', "Alert", "again", key='chrome.exe')
+        drain(dispatcher, 2)
+    finally:
+        dispatcher.stop()
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_notification_backend('nope')
@@ -0,0 +1,138 @@
+# test_policies.py
+
+import threading
+from datetime import datetime
+
+import pytest
+
+from blocker import BlockReport
+from policies import BlockScheduler
+
+class FakeBlocker:
+    """Records what the scheduler asks the AppBlocker to do."""
+
+    def __init__(self):
+        self.blocked = frozenset()
+        self.calls = []
+        self.enforced = threading.Event()
+
+    def set_blocked(self, names):
+        self.blocked = names
+
+    def enforce(self, pids=None):
+        self.calls.append(pids)
+        self.enforced.set()
+        return BlockReport(len(self.calls), 0.0, [], [], [], [])
+
+@pytest.fixture
+def blocker():
+    return FakeBlocker()
+
+@pytest.fixture
+def scheduler(blocker, clock, monitor):
+    return BlockScheduler(blocker, interval=5, clock=clock, events=monitor)
+
+def tick(scheduler, clock, now):
+    # One pass of the worker loop without starting the thread
+    clock.now = now
+    scheduler._advance(now)
+    scheduler._publish()
+
+def test_a_policy_is_active_only_inside_its_window(scheduler, blocker, clock):
+    scheduler.schedule('focus', {'game.exe'}, 100, 200)
+    assert scheduler.active == ()
+
+    tick(scheduler, clock, 100)
+    assert [policy.name for policy in scheduler.active] == ['focus']
+    assert blocker.blocked == frozenset({'game.exe'})
+
+    tick(scheduler, clock, 200)
+    assert scheduler.active == ()
+    assert blocker.blocked == frozenset()
+
+def test_expired_one_off_policies_are_removed(scheduler, clock):
+    scheduler.schedule('focus', {'game.exe'}, 100, 200)
+
+    tick(scheduler, clock, 250)
+
+    assert 'focus' not in scheduler.policies
+
+def test_rescheduling_skips_entries_queued_for_the_old_window(scheduler, clock):
+    scheduler.schedule('focus', {'game.exe'}, 100, 200)
+    scheduler.schedule('focus', {'game.exe'}, 300, 400)
+
+    # The old window's start entry comes up first and must not activate anything
+    tick(scheduler, clock, 150)
+    assert scheduler.active == ()
+
+    tick(scheduler, clock, 300)
+    assert [(policy.start, policy.end) for policy in scheduler.active] == [(300, 400)]
+
+def test_overlapping_windows_with_the_same_name_are_merged(scheduler):
+    scheduler.schedule('focus', {'game.exe'}, 100, 200)
+    policy = scheduler.schedule('focus', {'chat.exe'}, 150, 300)
+
+    assert (policy.start, policy.end) == (100, 300)
+    assert policy.apps == frozenset({'game.exe', 'chat.exe'})
+
+def test_extend_keeps_the_block_past_the_old_end(scheduler, clock):
+    scheduler.schedule('focus', {'game.exe'}, 100, 200)
+    tick(scheduler, clock, 150)
+
+    assert scheduler.extend('focus', 60)
+
+    tick(scheduler, clock, 220)
+    assert [policy.end for policy in scheduler.active] == [260]
+    tick(scheduler, clock, 260)
+    assert scheduler.active == ()
+
+def test_extend_refuses_missing_and_ended_policies(scheduler, clock):
+    assert not scheduler.extend('focus', 60)
+
+    scheduler.schedule('focus', {'game.exe'}, 100, 200)
+    clock.now = 200
+    assert not scheduler.extend('focus', 60)
+
+def test_cancel_lifts_the_block_and_ignores_its_queued_end(scheduler, blocker, clock):
+    scheduler.schedule('focus', {'game.exe'}, 100, 200)
+    tick(scheduler, clock, 150)
+
+    scheduler.cancel('focus')
+    assert blocker.blocked == frozenset()
+
+    # A new policy with the same name must survive the cancelled one's end entry
+    scheduler.schedule('focus', {'chat.exe'}, 150, 400)
+    tick(scheduler, clock, 200)
+    assert [policy.apps for policy in scheduler.active] == [frozenset({'chat.exe'})]
+
+def test_a_recurring_policy_rolls_forward_to_its_next_occurrence(scheduler, clock):
+    start = datetime(2026, 3, 2, 9).timestamp()
+    end = datetime(2026, 3, 2, 17).timestamp()
+    scheduler.schedule('work', {'game.exe'}, start, end, recurrence='daily')
+
+    # Skipped a few days (e.g. suspended): only the next future occurrence is queued
+    tick(scheduler, clock, datetime(2026, 3, 5, 8).timestamp())
+
+    policy = scheduler.policies['work']
+    assert policy.start == datetime(2026, 3, 5, 9).timestamp()
+    assert policy.end == datetime(2026, 3, 5, 17).timestamp()
+    assert scheduler.active == ()
+
+def test_unknown_recurrence_and_empty_windows_are_rejected(scheduler):
+    with pytest.raises(ValueError):
+        scheduler.schedule('focus', {'game.exe'}, 100, 200, recurrence='hourly')
+    with pytest.raises(ValueError):
+        scheduler.schedule('focus', {'game.exe'}, 200, 200)
+
+def test_the_worker_enforces_active_policies(scheduler, blocker, clock):
+    clock.now = 150
+    scheduler.schedule('focus', {'game.exe'}, 100, 200)
+    scheduler.start()
+    try:
+        assert blocker.enforced.wait(5)
+    finally:
+        scheduler.stop()
+        scheduler.join(5)
+
+    assert blocker.calls[0] is None
+    assert len(scheduler.reports) >= 1
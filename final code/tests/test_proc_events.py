@@ -0,0 +1,63 @@
+# test_proc_events.py
+
+import errno
+import os
+
+import pytest
+
+from proc_events import (ProcConnectorSource, ProcDiffSource, ProcessEvent, get_process_event_source,
+                         NLMSGHDR, CN_MSG, PROC_EVENT_HEADER, FORK_EVENT, EXEC_EVENT, EXIT_EVENT, ACK_EVENT,
+                         NLMSG_DONE, CN_IDX_PROC, CN_VAL_PROC, PROC_EVENT_NONE, PROC_EVENT_FORK,
+                         PROC_EVENT_EXEC, PROC_EVENT_EXIT)
+
+def message(what, body):
+    """One netlink message carrying a proc connector event, padded like the kernel's."""
+    event = PROC_EVENT_HEADER.pack(what, 0, 0) + body
+    payload = CN_MSG.pack(CN_IDX_PROC, CN_VAL_PROC, 0, 1, len(event), 0) + event
+    data = NLMSGHDR.pack(NLMSGHDR.size + len(payload), NLMSG_DONE, 0, 0, 0) + payload
+    return data + b'\0' * (-len(data) % 4)
+
+def parse(data):
+    return [ProcConnectorSource._parse(data, offset + CN_MSG.size)
+            for offset in ProcConnectorSource._messages(data)]
+
+def test_fork_of_a_process_is_a_start():
+    assert parse(message(PROC_EVENT_FORK, FORK_EVENT.pack(1, 1, 42, 42))) == [ProcessEvent('start', 42)]
+
+def test_thread_fork_and_exit_are_dropped():
+    thread_fork = message(PROC_EVENT_FORK, FORK_EVENT.pack(42, 42, 43, 42))
+    thread_exit = message(PROC_EVENT_EXIT, EXIT_EVENT.pack(43, 42) + b'\0' * 8)
+    assert parse(thread_fork + thread_exit) == [None, None]
+
+def test_exec_and_exit_report_the_process():
+    data = (message(PROC_EVENT_EXEC, EXEC_EVENT.pack(42, 42)) +
+            message(PROC_EVENT_EXIT, EXIT_EVENT.pack(42, 42) + b'\0' * 8))
+    assert parse(data) == [ProcessEvent('exec', 42), ProcessEvent('exit', 42)]
+
+def test_truncated_event_is_ignored():
+    data = message(PROC_EVENT_EXEC, EXEC_EVENT.pack(42, 42))
+    assert ProcConnectorSource._parse(data, len(data) - 4) is None
+
+def test_ack_carries_the_errno():
+    offset = NLMSGHDR.size + CN_MSG.size
+    assert ProcConnectorSource._parse_ack(message(PROC_EVENT_NONE, ACK_EVENT.pack(0)), offset) == 0
+    assert ProcConnectorSource._parse_ack(message(PROC_EVENT_NONE, ACK_EVENT.pack(errno.EPERM)), offset) == errno.EPERM
+    assert ProcConnectorSource._parse_ack(message(PROC_EVENT_EXEC, EXEC_EVENT.pack(42, 42)), offset) is None
+    assert parse(message(PROC_EVENT_NONE, ACK_EVENT.pack(0))) == [None]
+
+def test_proc_diff_reports_starts_then_execs_and_exits(tmp_path):
+    (tmp_path / '1').mkdir()
+    (tmp_path / 'self').mkdir()
+    source = ProcDiffSource(root=str(tmp_path), interval=0)
+    (tmp_path / '42').mkdir()
+    assert source.read(0) == [ProcessEvent('start', 42)]
+    os.rmdir(tmp_path / '1')
+    assert sorted(source.read(0)) == [ProcessEvent('exec', 42), ProcessEvent('exit', 1)]
+    assert source.read(0) == []
+
+def test_event_source_can_be_turned_off():
+    assert get_process_event_source('off') is None
+
+def test_unknown_event_source():
+    with pytest.raises(ValueError):
+        get_process_event_source('nope')
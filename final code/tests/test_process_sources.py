@@ -0,0 +1,56 @@
+# test_process_sources.py
+
+import psutil
+import pytest
+
+from process_sources import StaticProcessSource, ProcfsProcessSource, get_process_source
+
+def write_proc(root, pid, comm, ppid, start_ticks, cmdline=b''):
+    proc = root / str(pid)
+    proc.mkdir()
+    (proc / 'comm').write_bytes(comm.encode() + b'\n')
+    (proc / 'cmdline').write_bytes(cmdline)
+    # pid (comm) state ppid ... with starttime as the 22nd field
+    fields = ['S', str(ppid)] + ['0'] * 17 + [str(start_ticks)] + ['0'] * 10
+    (proc / 'stat').write_bytes(f"{pid} ({comm}) {' '.join(fields)}\n".encode())
+
+@pytest.fixture
+def proc_root(tmp_path):
+    (tmp_path / 'stat').write_bytes(b"cpu  1 2 3\nbtime 1000\n")
+    (tmp_path / 'self').mkdir()
+    return tmp_path
+
+def test_static_source_describes_its_table():
+    source = StaticProcessSource({1: (10.0, 'init', 0), 42: (20.0, 'chrome.exe', 1)})
+    assert sorted(source.pids()) == [1, 42]
+    assert source.describe(42) == (20.0, 'chrome.exe', 1)
+
+def test_static_source_reflects_churn():
+    source = StaticProcessSource({1: (10.0, 'init', 0)})
+    source.table[7] = (30.0, 'code.exe', 1)
+    del source.table[1]
+    assert source.pids() == [7]
+    with pytest.raises(psutil.NoSuchProcess):
+        source.describe(1)
+
+def test_procfs_source_reads_pids_names_and_start_times(proc_root):
+    write_proc(proc_root, 1, 'init', 0, 100)
+    write_proc(proc_root, 42, 'my (odd) app', 1, 500)
+    source = ProcfsProcessSource(root=str(proc_root))
+    ticks = source._clock_ticks
+    assert sorted(source.pids()) == [1, 42]
+    assert source.describe(42) == (1000 + 500 / ticks, 'my (odd) app', 1)
+
+def test_procfs_source_recovers_truncated_names_from_cmdline(proc_root):
+    write_proc(proc_root, 5, 'GitHubDesktop.e', 1, 0, cmdline=b'C:/apps/GitHubDesktop.exe\0--flag\0')
+    source = ProcfsProcessSource(root=str(proc_root))
+    assert source.describe(5)[1] == 'GitHubDesktop.exe'
+
+def test_procfs_source_missing_pid(proc_root):
+    source = ProcfsProcessSource(root=str(proc_root))
+    with pytest.raises(psutil.NoSuchProcess):
+        source.describe(99)
+
+def test_unknown_process_source():
+    with pytest.raises(ValueError):
+        get_process_source('nope')
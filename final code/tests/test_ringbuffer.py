@@ -0,0 +1,82 @@
+# test_ringbuffer.py
+
+import numpy as np
+import pytest
+
+import ringbuffer
+from ringbuffer import FLAG_STARTED, SampleRing
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'samples.ring')
+
+def test_latest_returns_the_window_oldest_first(path):
+    ring = SampleRing(path, capacity=16, writable=True)
+    for ts in range(100, 106):
+        ring.append(float(ts), [1, 2], 0)
+
+    window = ring.latest(2, now=105.0)
+
+    assert list(window['timestamp']) == [103.0, 103.0, 104.0, 104.0, 105.0, 105.0]
+    assert list(window['app_id']) == [1, 2] * 3
+    assert ring.write_seq == 12
+
+def test_an_unwrapped_window_is_a_view_into_the_ring(path):
+    ring = SampleRing(path, capacity=16, writable=True)
+    for ts in range(100, 104):
+        ring.append(float(ts), [1], 0)
+
+    window = ring.latest(10, now=103.0)
+
+    assert np.shares_memory(window, ring._records)
+
+def test_wrapping_overwrites_the_oldest_records(path):
+    ring = SampleRing(path, capacity=4, writable=True)
+    for ts in range(100, 106):
+        ring.append(float(ts), [1], FLAG_STARTED)
+
+    window = ring.latest(100, now=105.0)
+
+    assert list(window['timestamp']) == [102.0, 103.0, 104.0, 105.0]
+    assert set(window['flags']) == {FLAG_STARTED}
+
+def test_the_walk_crosses_chunk_and_wrap_boundaries(path, monkeypatch):
+    monkeypatch.setattr(ringbuffer, 'LATEST_CHUNK', 3)
+    ring = SampleRing(path, capacity=8, writable=True)
+    for ts in range(100, 111):
+        ring.append(float(ts), [1], 0)
+
+    assert list(ring.latest(6, now=110.0)['timestamp']) == [104.0 + i for i in range(7)]
+
+def test_the_walk_stops_at_a_backward_clock_step(path):
+    ring = SampleRing(path, capacity=16, writable=True)
+    for ts in (100.0, 101.0, 50.0, 102.0, 103.0):
+        ring.append(ts, [1], 0)
+
+    # The record stamped 50 is too old, so nothing before it is returned
+    assert list(ring.latest(5, now=103.0)['timestamp']) == [102.0, 103.0]
+
+def test_a_reader_sees_the_writers_records(path):
+    writer = SampleRing(path, capacity=8, writable=True)
+    reader = SampleRing(path)
+    writer.append(100.0, [3], 0)
+
+    assert reader.capacity == 8
+    assert list(reader.latest(10, now=100.0)['app_id']) == [3]
+
+def test_reopening_the_writer_keeps_the_records(path):
+    ring = SampleRing(path, capacity=8, writable=True)
+    ring.append(100.0, [3], 0)
+    ring.close()
+
+    ring = SampleRing(path, capacity=8, writable=True)
+
+    assert ring.write_seq == 1
+    assert list(ring.latest(10, now=100.0)['app_id']) == [3]
+
+def test_a_foreign_file_is_rejected(path):
+    with open(path, 'wb') as f:
+        f.write(b'\0' * 64)
+
+    with pytest.raises(ValueError):
+        SampleRing(path)
@@ -0,0 +1,78 @@
+# test_rollups.py
+
+from datetime import datetime
+
+import pytest
+
+from rollups import bucket_start, next_bucket, plan_range, split_by_bucket
+from store import UsageStore
+
+DAY = datetime(2026, 3, 2).timestamp()
+HOUR = datetime(2026, 3, 2, 10).timestamp()
+
+@pytest.fixture
+def store(tmp_path):
+    return UsageStore(str(tmp_path / 'usage.db'), flush_interval=3600)
+
+def test_buckets_align_to_local_time():
+    moment = datetime(2026, 3, 2, 10, 17, 42).timestamp()
+
+    assert bucket_start('minute', moment) == datetime(2026, 3, 2, 10, 17).timestamp()
+    assert bucket_start('hour', moment) == HOUR
+    assert bucket_start('day', moment) == DAY
+    assert next_bucket('day', DAY) == datetime(2026, 3, 3).timestamp()
+
+@pytest.mark.parametrize('level, span', [('minute', 60), ('hour', 3600), ('day', 86400)])
+def test_split_by_bucket_cuts_at_each_boundary(level, span):
+    start = HOUR - 10
+    end = HOUR + 2 * span + 5
+    pieces = list(split_by_bucket(level, start, end))
+
+    assert sum(seconds for _, seconds in pieces) == pytest.approx(end - start)
+    assert [bucket for bucket, _ in pieces] == sorted(bucket for bucket, _ in pieces)
+    assert pieces[0][0] == bucket_start(level, start)
+    assert len(pieces) == len({bucket for bucket, _ in pieces})
+
+def test_plan_range_uses_the_coarsest_whole_buckets():
+    start = datetime(2026, 3, 1, 22, 30, 15).timestamp()
+    end = datetime(2026, 3, 3, 1, 2, 20).timestamp()
+
+    plan = plan_range(start, end)
+
+    assert plan == [
+        (None, start, datetime(2026, 3, 1, 22, 31).timestamp()),
+        ('minute', datetime(2026, 3, 1, 22, 31).timestamp(), datetime(2026, 3, 1, 23).timestamp()),
+        ('hour', datetime(2026, 3, 1, 23).timestamp(), DAY),
+        ('day', DAY, datetime(2026, 3, 3).timestamp()),
+        ('hour', datetime(2026, 3, 3).timestamp(), datetime(2026, 3, 3, 1).timestamp()),
+        ('minute', datetime(2026, 3, 3, 1).timestamp(), datetime(2026, 3, 3, 1, 2).timestamp()),
+        (None, datetime(2026, 3, 3, 1, 2).timestamp(), end),
+    ]
+
+def test_plan_range_inside_one_minute_reads_raw_intervals():
+    assert plan_range(HOUR + 5, HOUR + 50) == [(None, HOUR + 5, HOUR + 50)]
+    assert plan_range(HOUR, HOUR) == []
+
+def test_range_totals_from_rollups_match_the_raw_intervals(store):
+    store.record([('Code.exe', DAY - 4000, DAY + 7300.5), ('chrome.exe', HOUR + 20, HOUR + 200)])
+    store.flush()
+
+    for start, end in [(DAY - 3600, DAY + 3600), (HOUR + 30, HOUR + 90), (0.0, DAY + 86400)]:
+        assert store.app_totals(start, end) == pytest.approx(store._raw_app_totals(start, end))
+
+def test_an_open_interval_flushed_twice_is_rolled_up_once(store):
+    store.record([], [('Code.exe', HOUR, HOUR + 60)])
+    store.flush()
+    store.record([('Code.exe', HOUR, HOUR + 150)])
+    store.flush()
+
+    assert store.app_totals(HOUR, HOUR + 3600) == {'Code.exe': 150}
+
+def test_rebuild_rollups_reproduces_the_incremental_totals(store):
+    store.record([('Code.exe', DAY - 4000, DAY + 7300.5)])
+    store.flush()
+    before = store.category_totals(0.0, DAY + 86400)
+
+    store.rebuild_rollups()
+
+    assert store.category_totals(0.0, DAY + 86400) == pytest.approx(before)
@@ -0,0 +1,68 @@
+# test_scanner.py
+
+import pytest
+
+from process_sources import StaticProcessSource
+from scanner import ProcessScanner
+
+@pytest.fixture
+def source():
+    return StaticProcessSource({1: (1.0, 'init', 0), 10: (2.0, 'chrome.exe', 1)})
+
+def test_full_scan_resolves_new_pids_and_evicts_exited_ones(source, clock):
+    scanner = ProcessScanner(source, clock=clock)
+    assert scanner.scan() == source.table
+    source.table[20] = (3.0, 'code.exe', 1)
+    del source.table[10]
+    assert set(scanner.scan()) == {1, 20}
+    assert (scanner.resolved, scanner.evicted) == (1, 1)
+
+def test_resync_replaces_reused_pids(source, clock):
+    scanner = ProcessScanner(source, clock=clock, resync_interval=60)
+    scanner.scan()
+    source.table[10] = (5.0, 'code.exe', 1)  # pid 10 exited and was reused
+    clock.now = 30.0
+    assert scanner.scan()[10][1] == 'chrome.exe'
+    clock.now = 60.0
+    assert scanner.scan()[10] == (5.0, 'code.exe', 1)
+    assert scanner.replaced == 1
+
+def test_events_are_applied_without_walking_the_table(source, clock, monitor):
+    scanner = ProcessScanner(source, events=monitor, clock=clock)
+    scanner.scan()
+    source.table[20] = (3.0, 'code.exe', 1)
+    source.table[30] = (4.0, 'hidden', 1)  # no event for this one
+    del source.table[10]
+    monitor.emit(('start', 20), ('exit', 10))
+    clock.now = 1.0
+    assert set(scanner.scan()) == {1, 20}
+    assert (scanner.resolved, scanner.evicted) == (1, 1)
+
+def test_exec_event_refreshes_the_name(source, clock, monitor):
+    scanner = ProcessScanner(source, events=monitor, clock=clock)
+    scanner.scan()
+    source.table[10] = (2.0, 'steam.exe', 1)
+    monitor.emit(('exec', 10))
+    assert scanner.scan()[10][1] == 'steam.exe'
+
+def test_exit_of_an_unknown_pid_is_ignored(source, clock, monitor):
+    scanner = ProcessScanner(source, events=monitor, clock=clock)
+    scanner.scan()
+    assert scanner._apply({99: 'exit'}) == source.table
+    assert scanner.evicted == 0
+
+def test_lost_events_force_a_full_rescan(source, clock, monitor):
+    scanner = ProcessScanner(source, events=monitor, clock=clock)
+    scanner.scan()
+    source.table[30] = (4.0, 'code.exe', 1)
+    monitor.emit(('lost', None))
+    assert 30 in scanner.scan()
+
+def test_backlog_overflow_falls_back_to_a_full_rescan(source, clock, monitor):
+    scanner = ProcessScanner(source, events=monitor, clock=clock, max_pending=3)
+    scanner.scan()
+    for pid in range(100, 110):
+        source.table[pid] = (5.0, 'worker', 1)
+    monitor.emit(*[('start', pid) for pid in range(100, 110)])
+    assert scanner._changed == {}
+    assert set(scanner.scan()) == set(source.table)
@@ -0,0 +1,133 @@
+# timeline.py
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from enrich import categorize_series
+from utils import get_display_name, get_category_color
+
+# Horizontal resolution the charts are prepared for; nothing finer than a pixel is shipped
+CHART_WIDTH_PX = 1200
+# Points per series in the stacked category chart
+MAX_SERIES_POINTS = 1000
+# Finest bucket of the category series before downsampling, in seconds
+BASE_BUCKET_SECONDS = 60
+
+def local_datetimes(timestamps):
+    """Naive local datetimes for an array of epoch seconds, as the charts display them."""
+    return pd.to_datetime(timestamps, unit='s', utc=True).tz_convert(datetime.now().astimezone().tzinfo).tz_localize(None)
+
+def interval_arrays(intervals, start, end):
+    """Split UsageIntervals into (apps, starts, ends) arrays clipped to [start, end)."""
+    if not intervals:
+        return np.array([], dtype=object), np.zeros(0), np.zeros(0)
+    apps, starts, ends = zip(*intervals)
+    starts = np.clip(np.array(starts, dtype=float), start, end)
+    ends = np.clip(np.array(ends, dtype=float), start, end)
+    keep = ends > starts
+    return np.array(apps, dtype=object)[keep], starts[keep], ends[keep]
+
+def merge_intervals(apps, starts, ends, resolution):
+    """
+    Merge each app's intervals separated by gaps shorter than `resolution` seconds.
+
+    With the resolution set to the span of one pixel, no lane ends up with more bars
+    than the chart is wide, whatever the length of the range.
+    """
+    frame = pd.DataFrame({'app': apps, 'start': starts, 'end': ends}).sort_values(['app', 'start'])
+    reach = frame.groupby('app')['end'].cummax().groupby(frame['app']).shift()
+    run = (reach.isna() | (frame['start'] > reach + resolution)).cumsum()
+    return frame.groupby(run).agg(app=('app', 'first'), start=('start', 'min'), end=('end', 'max'))
+
+def timeline_frame(intervals, start, end, width=CHART_WIDTH_PX):
+    """One row per merged bar of the per-app timeline over [start, end)."""
+    apps, starts, ends = interval_arrays(intervals, start, end)
+    if len(apps) == 0:
+        return None
+    bars = merge_intervals(apps, starts, ends, (end - start) / width)
+    bars['Application'] = bars['app'].map(get_display_name)
+    bars['Category'] = categorize_series(bars['app']).astype(str)
+    bars['Start'] = local_datetimes(bars['start'].values)
+    bars['End'] = local_datetimes(bars['end'].values)
+    return bars[['Application', 'Category', 'Start', 'End']]
+
+def _covered_until(edges, grid):
+    """For each grid point k, the sum over edges a <= k of (k - a)."""
+    first = np.ceil(edges).astype(np.int64)
+    count = np.cumsum(np.bincount(first, minlength=len(grid))[:len(grid)])
+    total = np.cumsum(np.bincount(first, weights=edges, minlength=len(grid))[:len(grid)])
+    return grid * count - total
+
+def bucket_coverage(starts, ends, start, bucket, buckets):
+    """
+    Seconds of [starts, ends) falling into each of `buckets` buckets from `start`.
+
+    Computed with prefix sums over the interval edges, so the cost is
+    O(intervals + buckets) rather than one pass over the buckets per interval.
+    """
+    grid = np.arange(buckets + 1, dtype=float)
+    a = (starts - start) / bucket
+    b = (ends - start) / bucket
+    covered = _covered_until(a, grid) - _covered_until(b, grid)
+    return np.diff(covered) * bucket
+
+def lttb_indices(x, y, threshold):
+    """
+    Indices of the points Largest-Triangle-Three-Buckets keeps out of (x, y).
+
+    The first and last points are always kept; each bucket in between contributes
+    the point forming the largest triangle with the previous pick and the average
+    of the next bucket.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    picked = np.empty(threshold, dtype=np.int64)
+    picked[0], picked[-1] = 0, n - 1
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    previous = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo, next_hi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = y[next_lo:next_hi].mean()
+        areas = np.abs((x[previous] - avg_x) * (y[lo:hi] - y[previous]) -
+                       (x[previous] - x[lo:hi]) * (avg_y - y[previous]))
+        previous = lo + int(np.argmax(areas))
+        picked[i + 1] = previous
+    return picked
+
+def category_area_frame(intervals, start, end, points=MAX_SERIES_POINTS):
+    """
+    Minutes per category per bucket over [start, end), downsampled to at most `points` rows.
+
+    The categories are stacked in the chart, so LTTB picks the rows on the total and
+    every category keeps the same timestamps.
+    """
+    apps, starts, ends = interval_arrays(intervals, start, end)
+    if len(apps) == 0:
+        return None
+    buckets = max(1, int(np.ceil((end - start) / BASE_BUCKET_SECONDS)))
+    categories = categorize_series(pd.Series(apps)).astype(str).values
+    series = {category: bucket_coverage(starts[categories == category], ends[categories == category],
+                                        start, BASE_BUCKET_SECONDS, buckets) / 60
+              for category in np.unique(categories)}
+    index = local_datetimes(start + np.arange(buckets) * BASE_BUCKET_SECONDS)
+    frame = pd.DataFrame(series, index=index)
+    keep = lttb_indices(np.arange(buckets, dtype=float), frame.sum(axis=1).values, points)
+    return frame.iloc[keep]
+
+def timeline_chart(bars):
+    """Gantt-style chart with one lane per app, colored by category."""
+    import altair as alt
+    categories = sorted(bars['Category'].unique())
+    return alt.Chart(bars).mark_bar().encode(
+        x=alt.X('Start:T', title='Time'),
+        x2='End:T',
+        y=alt.Y('Application:N', title=None),
+        color=alt.Color('Category:N', scale=alt.Scale(domain=categories,
+                                                      range=[get_category_color(c) for c in categories])),
+        tooltip=['Application', 'Category', 'Start:T', 'End:T']
+    )
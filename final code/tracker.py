@@ -1,62 +1,80 @@
 # tracker.py
 
-import time
 import psutil
 from collections import defaultdict
-from plyer import notification
-from constants import NOTIFICATION_THRESHOLD, NOTIFICATION_COOLDOWN, IGNORED_APPS, APP_DISPLAY_NAMES, BLUE_LIGHT_THRESHOLD,EVENING_HOUR_END,EVENING_HOUR_START
-from utils import get_display_name
-from datetime import datetime
-
-last_notification = {}
+from notifier import get_dispatcher
+from app_index import APP_INDEX
 
 def send_notification(app_name, usage_time):
-    """Send smart notifications with context-aware messages."""
-    current_time = time.time()
-    if app_name not in last_notification or \
-       (current_time - last_notification.get(app_name, 0)) > NOTIFICATION_COOLDOWN:
-        
-        message = (f"You've been using {app_name} for {usage_time:.1f} sec.\n"
-                  f"Time for a quick break! 🎯")
-        
-        notification.notify(
-            title="⏰ Smart Screen Time Alert",
-            message=message,
-            timeout=10
-        )
-        last_notification[app_name] = current_time
+    """Queue a smart notification with a context-aware message; never blocks."""
+    message = (f"You've been using {app_name} for {usage_time:.1f} sec.\n"
+              f"Time for a quick break! 🎯")
+    get_dispatcher().submit('usage', "⏰ Smart Screen Time Alert", message, key=app_name)
 
 def send_blue_light_notification():
-    """Send a notification to enable blue light filter."""
-    notification.notify(
-        title="🕶️ Blue Light Filter Suggestion",
-        message="It's evening time! Enable your blue light filter to reduce eye strain and improve sleep quality.",
-        timeout=10
+    """Queue a notification to enable blue light filter; never blocks."""
+    get_dispatcher().submit(
+        'blue_light',
+        "🕶️ Blue Light Filter Suggestion",
+        "It's evening time! Enable your blue light filter to reduce eye strain and improve sleep quality."
+    )
+
+def send_eye_break_notification(continuous_minutes):
+    """Queue a reminder to rest the eyes after a long unbroken screen streak; never blocks."""
+    get_dispatcher().submit(
+        'eye_break',
+        "👁️ Time for an Eye Break",
+        f"You've been at the screen for {continuous_minutes:.0f} minutes without a break. "
+        f"Look 20 feet away for 20 seconds."
     )
 
-def track_screen_time(duration=60):
-    """Track screen time usage with enhanced display names."""
-    screen_time = defaultdict(int)
-    start_time = time.time()
-    
-    while time.time() - start_time < duration:
-        for proc in psutil.process_iter(['pid', 'name']):
-            try:
-                name = proc.info['name']
-                if name in APP_DISPLAY_NAMES and name not in IGNORED_APPS:
-                    screen_time[name] += 1
-                    
-                    if screen_time[name]  >= NOTIFICATION_THRESHOLD * 60:
-                        send_notification(get_display_name(name), screen_time[name])
-                        
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
-        
-        # Check for blue light filter suggestion
-        current_hour = datetime.now().hour
-        if EVENING_HOUR_START <= current_hour < EVENING_HOUR_END:
-            send_blue_light_notification()
-        
-        time.sleep(1)
-
-    return screen_time
\ No newline at end of file
+def aggregate_apps(processes):
+    """
+    Collapse a pid -> (name, ppid) process table into one entry per tracked app.
+
+    Processes sharing a tracked name count as one app, and untracked helper
+    processes are attributed to the nearest tracked ancestor in the process tree.
+    Returns a dict of app name -> number of processes belonging to it.
+    """
+    owners = {}  # pid -> owning app name (or None), memoised across the walk
+    counts = defaultdict(int)
+    lookup = APP_INDEX.lookup
+
+    def owner_of(pid):
+        chain = []
+        owner = None
+        while pid in processes and pid not in owners:
+            name, ppid = processes[pid]
+            chain.append(pid)
+            owners[pid] = None  # provisional, also guards against ppid cycles
+            record = lookup(name)
+            if record is not None:
+                owner = record.name
+                break
+            if ppid == pid:
+                break
+            pid = ppid
+        else:
+            owner = owners.get(pid)
+        for visited in chain:
+            owners[visited] = owner
+        return owner
+
+    for pid in processes:
+        app = owner_of(pid)
+        if app is not None:
+            counts[app] += 1
+    return counts
+
+def sample_running_apps(scanner=None):
+    """Return the tracked applications running right now with their process counts."""
+    if scanner is not None:
+        return aggregate_apps(scanner.processes())
+
+    processes = {}
+    for proc in psutil.process_iter(['pid', 'name', 'ppid']):
+        try:
+            processes[proc.info['pid']] = (proc.info['name'], proc.info['ppid'])
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            continue
+    return aggregate_apps(processes)
@@ -1,19 +1,19 @@
 # utils.py
 
-from constants import APP_DISPLAY_NAMES, APP_CATEGORIES
+from app_index import APP_INDEX
 
 def get_display_name(app_name):
     """Get the friendly display name for an application."""
-    return APP_DISPLAY_NAMES.get(app_name, app_name)
+    return APP_INDEX.display_name(app_name)
 
 def categorize_app(app_name):
     """Categorize an application based on its name with enhanced matching."""
-    app_lower = app_name.lower()
-    for category, info in APP_CATEGORIES.items():
-        if any(app.lower() in app_lower for app in info['apps']):
-            return category
-    return 'Other'
+    return APP_INDEX.categorize(app_name)
 
 def get_category_emoji(category):
     """Get the emoji for a category."""
-    return APP_CATEGORIES.get(category, {}).get('emoji', '📱')
\ No newline at end of file
+    return APP_INDEX.category_emoji(category)
+
+def get_category_color(category):
+    """Get the chart color for a category."""
+    return APP_INDEX.category_color(category)
\ No newline at end of file
@@ -1,12 +1,23 @@
 # visualization.py
 
-import matplotlib.pyplot as plt
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
 import pandas as pd
-from constants import APP_CATEGORIES
-from utils import categorize_app
+from constants import RENDER_CACHE_SIZE
+from utils import get_category_color
+from enrich import as_enriched
+
+# Top apps shown in the bar chart
+TOP_APPS = 8
 
 def plot_screen_time(data):
     """Enhanced visualization of screen time usage."""
+    # matplotlib is only loaded once a chart actually has to be drawn
+    import matplotlib.pyplot as plt
+    
     plt.style.use('default')  # Using default style instead of seaborn
     
     # Create figure with white background
@@ -14,9 +25,9 @@ def plot_screen_time(data):
     fig.patch.set_facecolor('white')
     
     # Prepare data for plotting
-    plot_data = data.head(8)
-    categories = plot_data['Application'].apply(categorize_app)
-    colors = [APP_CATEGORIES.get(cat, {}).get('color', '#95a5a6') for cat in categories]
+    usage = as_enriched(data)
+    plot_data = usage.frame.head(TOP_APPS)
+    colors = plot_data['Color'].tolist()
     
     # Bar chart with category-based colors
     ax1.set_facecolor('white')
@@ -29,11 +40,9 @@ def plot_screen_time(data):
     
     # Category distribution pie chart
     ax2.set_facecolor('white')
-    category_data = data.copy()
-    category_data['Category'] = category_data['Application'].apply(categorize_app)
-    category_usage = category_data.groupby('Category')['Time_Minutes'].sum()
+    category_usage = usage.category_usage
     
-    colors = [APP_CATEGORIES.get(cat, {}).get('color', '#95a5a6') for cat in category_usage.index]
+    colors = [get_category_color(cat) for cat in category_usage.index]
     wedges, texts, autotexts = ax2.pie(category_usage, 
                                       labels=category_usage.index,
                                       colors=colors,
@@ -46,4 +55,82 @@ def plot_screen_time(data):
     plt.setp(texts, size=9)
     
     plt.tight_layout()
-    return fig
\ No newline at end of file
+    return fig
+
+def screen_time_fingerprint(data):
+    """
+    Digest of exactly what plot_screen_time() draws.
+
+    Minutes are rounded to a tenth first, so samples that would not visibly change
+    the chart map to the same fingerprint.
+    """
+    usage = as_enriched(data)
+    plot_data = usage.frame.head(TOP_APPS)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(pd.util.hash_pandas_object(plot_data['Display_Name'], index=False).values.tobytes())
+    digest.update(plot_data['Time_Minutes'].round(1).values.tobytes())
+    digest.update(pd.util.hash_pandas_object(plot_data['Color'], index=False).values.tobytes())
+    category_usage = usage.category_usage.round(1)
+    digest.update(pd.util.hash_pandas_object(category_usage.index.astype(str).to_series(), index=False).values.tobytes())
+    digest.update(category_usage.values.astype(float).tobytes())
+    return digest.hexdigest()
+
+class RenderCache:
+    """Thread-safe LRU of rendered chart bytes keyed by data fingerprint."""
+
+    def __init__(self, max_entries=RENDER_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            image = self._entries.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return image
+
+    def put(self, key, image):
+        with self._lock:
+            self._entries[key] = image
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+_render_cache = RenderCache()
+# pyplot keeps global state, so only one chart is drawn at a time across sessions
+_render_lock = threading.Lock()
+
+def render_screen_time_png(data, cache=None):
+    """
+    PNG bytes of plot_screen_time() for `data`.
+
+    Unchanged data is served from the render cache without touching matplotlib;
+    otherwise the figure is drawn, saved and closed right away.
+    """
+    cache = _render_cache if cache is None else cache
+    key = screen_time_fingerprint(data)
+    image = cache.get(key)
+    if image is not None:
+        return image
+
+    import matplotlib.pyplot as plt
+    with _render_lock:
+        fig = plot_screen_time(data)
+        try:
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format='png', facecolor=fig.get_facecolor())
+        finally:
+            plt.close(fig)
+    image = buffer.getvalue()
+    cache.put(key, image)
+    return image